@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import random
+import sys
+import time
+
+from generator import DockerComposeGenerator, OUTPUT_FORMATS
+from parser import DockerRunParser, ParseLimits
+
+
+def build_commands(count: int):
+    commands = []
+    for i in range(count):
+        commands.append(
+            f"docker run --name svc{i} --network net{i % 8} -p {10000 + i}:80 "
+            f"-e APP_ID={i} -e LOG_LEVEL=info -e REGION=eu-west-1 "
+            f"-v data{i % 16}:/var/lib/data -v ./conf:/etc/app:ro "
+            f"--label tier=web --restart unless-stopped --memory 512m -d example/app:1.{i}"
+        )
+    return commands
+
+
+def bench_emission(services, networks, volumes, repeat: int):
+    results = {}
+    for output_format in OUTPUT_FORMATS:
+        generator = DockerComposeGenerator(output_format=output_format)
+        best = None
+        size = 0
+        for _ in range(repeat):
+            buffer = io.StringIO()
+            start = time.perf_counter()
+            generator.write(buffer, services, networks, volumes)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            size = buffer.tell()
+        results[output_format] = (best, size)
+    return results
+
+
+def build_stress_corpus(limits: ParseLimits, fuzz_count: int, seed: int = 0):
+    # 按默认限制构造最坏情况输入：刚好不超限的长 token、触发重试的未闭合引号、超限输入等
+    length = limits.max_command_length - 64
+    prefix = 'docker run '
+    corpus = [
+        ('long double-quoted value', prefix + '-e "A=' + 'x' * length + '" img'),
+        ('long single-quoted value', prefix + "-e 'A=" + 'x' * length + "' img"),
+        ('escaped characters', prefix + '-e A=' + '\\x' * (length // 2) + ' img'),
+        ('unclosed double quote', prefix + '-e "A=' + 'x \\\\ ' * (length // 6)),
+        ('unclosed quote with continuations', prefix + '-e "A=' + '\\   \n' * (length // 6)),
+        ('trailing whitespace after backslash', prefix + '-e A=1 ' + '\\' + ' ' * length),
+        ('token limit', prefix + ''.join(f"{flag} v " for flag in ['-e', '-l', '-v', '--dns', '--add-host']
+                                          * (limits.max_tokens // 10 - 1)) + 'img'),
+        ('token flood', prefix + 'x ' * (length // 2)),
+        ('repeated flag', prefix + '-v a:b ' * (limits.max_values_per_flag + 1) + 'img'),
+        ('oversized command', prefix + 'x' * (length + 1024)),
+    ]
+    rng = random.Random(seed)
+    alphabet = ['a', '-', '-e', ' ', '\t', '\n', '\\', '"', "'", '=', ':', '#', '$']
+    for i in range(fuzz_count):
+        body = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 4096)))
+        corpus.append((f"fuzz #{i}", prefix + body))
+    return corpus
+
+
+def run_stress(limits: ParseLimits, fuzz_count: int, budget_ms: float) -> bool:
+    run_parser = DockerRunParser(limits)
+    worst_fuzz = (0.0, None)
+    within_budget = True
+
+    print(f"Parser worst-case latency (budget {budget_ms:.0f} ms)")
+    for name, command in build_stress_corpus(limits, fuzz_count):
+        start = time.perf_counter()
+        try:
+            run_parser.parse(command)
+            outcome = 'ok'
+        except ValueError as e:
+            outcome = str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        within_budget = within_budget and elapsed_ms <= budget_ms
+        if name.startswith('fuzz'):
+            worst_fuzz = max(worst_fuzz, (elapsed_ms, name), key=lambda w: w[0])
+            continue
+        print(f"  {name:<36} {elapsed_ms:>9.2f} ms  {outcome[:40]}")
+    print(f"  {'worst of ' + str(fuzz_count) + ' fuzz inputs':<36} {worst_fuzz[0]:>9.2f} ms")
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compose emission cost per output format')
+    parser.add_argument('-n', '--services', type=int, default=2000, help='Number of services (default: 2000)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs per format, best is reported (default: 3)')
+    parser.add_argument('--stress', action='store_true', help='Run the hostile-input parser corpus instead')
+    parser.add_argument('--fuzz', type=int, default=500, help='Random fuzz inputs for --stress (default: 500)')
+    parser.add_argument('--budget-ms', type=float, default=250.0,
+                        help='Worst-case parse latency budget for --stress (default: 250)')
+    args = parser.parse_args()
+
+    if args.stress:
+        if not run_stress(ParseLimits(), args.fuzz, args.budget_ms):
+            print("Error: Parser latency budget exceeded", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    run_parser = DockerRunParser()
+    parsed_list = [run_parser.parse(cmd) for cmd in build_commands(args.services)]
+    services, networks, volumes = DockerComposeGenerator().collect_from_parsed(parsed_list)
+
+    print(f"Emission cost for {len(services)} services (best of {args.repeat})")
+    print(f"{'format':<8} {'seconds':>10} {'us/service':>12} {'bytes':>12}")
+    for output_format, (seconds, size) in bench_emission(services, networks, volumes, args.repeat).items():
+        per_service = seconds / max(len(services), 1) * 1e6
+        print(f"{output_format:<8} {seconds:>10.4f} {per_service:>12.1f} {size:>12}")
+
+
+if __name__ == '__main__':
+    main()
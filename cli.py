@@ -1,6 +1,7 @@
 import argparse
+import os
 import sys
-from typing import List
+from typing import Dict, List
 
 
 class CLI:
@@ -34,6 +35,12 @@ class CLI:
             help='Read docker run commands from file',
             default=None
         )
+        parser.add_argument(
+            '--format',
+            choices=['yaml', 'json', 'ndjson'],
+            help='Output format (default: yaml); ndjson writes one service per line',
+            default='yaml'
+        )
         parser.add_argument(
             '--indent',
             type=int,
@@ -50,6 +57,146 @@ class CLI:
             action='store_true',
             help='Pretty print the output'
         )
+        parser.add_argument(
+            '--shard-by',
+            choices=['network', 'label', 'size'],
+            help='Split services into multiple compose files joined via include: (requires --output)',
+            default=None
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            help='Maximum number of services per shard file',
+            default=None
+        )
+        parser.add_argument(
+            '--shard-label',
+            type=str,
+            help='Label key used to group services when --shard-by label',
+            default=None
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compare with the existing compose file (--output or docker-compose.yml) '
+                 'and exit non-zero if it is out of date; never writes'
+        )
+        parser.add_argument(
+            '--plugins',
+            type=str,
+            help='YAML config file listing plugins (entry points are discovered automatically)',
+            default=None
+        )
+        parser.add_argument(
+            '-j', '--jobs',
+            type=int,
+            help='Parse and map commands in N worker processes (default: 1, serial)',
+            default=1
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Commands per worker task when --jobs > 1',
+            default=None
+        )
+        parser.add_argument(
+            '--targets',
+            type=str,
+            help='Comma-separated outputs to write from one parse: compose, k8s, systemd (default: compose)',
+            default='compose'
+        )
+        parser.add_argument(
+            '--systemd-engine',
+            choices=['podman', 'docker'],
+            help='Container engine used in generated systemd units (default: podman)',
+            default='podman'
+        )
+        parser.add_argument(
+            '--extract-secrets',
+            action='store_true',
+            help='Move credential-looking environment values into compose secrets backed by files in secrets/; '
+                 'KEY is replaced by KEY_FILE pointing at the /run/secrets path'
+        )
+        parser.add_argument(
+            '--secret-drop-env',
+            action='store_true',
+            help='With --extract-secrets, remove KEY instead of adding KEY_FILE '
+                 '(for images that read /run/secrets themselves)'
+        )
+        parser.add_argument(
+            '--check-ports',
+            action='store_true',
+            help='Report services whose published host ports overlap'
+        )
+        parser.add_argument(
+            '--remap-ports',
+            action='store_true',
+            help='Move conflicting host ports to the next free ports (not allowed with --profile production)'
+        )
+        parser.add_argument(
+            '--profile',
+            type=str,
+            help='Deployment profile the output is generated for (default: dev)',
+            default='dev'
+        )
+        parser.add_argument(
+            '--extract-env',
+            action='store_true',
+            help='Move environment variables shared by several services into env/ files referenced via env_file'
+        )
+        parser.add_argument(
+            '--env-min-keys',
+            type=int,
+            help='Minimum number of shared variables worth an env file (default: 3)',
+            default=3
+        )
+        parser.add_argument(
+            '--max-command-length',
+            type=int,
+            help='Reject commands longer than N characters (default: 262144)',
+            default=None
+        )
+        parser.add_argument(
+            '--max-tokens',
+            type=int,
+            help='Reject commands with more than N shell tokens (default: 20000)',
+            default=None
+        )
+        parser.add_argument(
+            '--max-flag-values',
+            type=int,
+            help='Reject commands repeating one flag more than N times (default: 5000)',
+            default=None
+        )
+        parser.add_argument(
+            '--max-output-bytes',
+            type=int,
+            help='Fail if a generated compose file exceeds N bytes; applies to each shard or variant file '
+                 'separately and not to --targets output (default: unlimited)',
+            default=None
+        )
+        parser.add_argument(
+            '--variant',
+            action='append',
+            metavar='ENV=FILE',
+            help='Environment variant of the same commands (repeatable); writes a shared base file '
+                 'plus one <output>.<ENV>.yml override per variant',
+            default=None
+        )
+        parser.add_argument(
+            '--export-corpus',
+            type=str,
+            metavar='PATH',
+            help='Parse the commands once and write them to a binary corpus file instead of generating output',
+            default=None
+        )
+        parser.add_argument(
+            '--from-corpus',
+            type=str,
+            metavar='PATH',
+            help='Read pre-parsed commands from a corpus file written by --export-corpus',
+            default=None
+        )
         return parser
 
     def parse_args(self, args: List[str] = None) -> argparse.Namespace:
@@ -61,42 +208,14 @@ class CLI:
         else:
             args = self.parse_args()
 
+        self._validate_args(args)
+
         commands = args.commands[:]
 
         if args.file:
-            try:
-                with open(args.file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 智能识别多个 docker run 命令
-                    # 找到所有 "docker run" 的位置
-                    docker_run_positions = []
-                    start = 0
-                    while True:
-                        pos = content.find('docker run', start)
-                        if pos == -1:
-                            break
-                        docker_run_positions.append(pos)
-                        start = pos + 1
-
-                    # 从每个 "docker run" 开始，到下一个 "docker run" 或文件结尾
-                    for i, pos in enumerate(docker_run_positions):
-                        start_pos = pos
-                        if i + 1 < len(docker_run_positions):
-                            end_pos = docker_run_positions[i + 1]
-                        else:
-                            end_pos = len(content)
-
-                        command = content[start_pos:end_pos].strip()
-                        if command:
-                            commands.append(command)
-            except FileNotFoundError:
-                print(f"Error: File '{args.file}' not found", file=sys.stderr)
-                sys.exit(1)
-            except Exception as e:
-                print(f"Error reading file: {e}", file=sys.stderr)
-                sys.exit(1)
+            commands.extend(self._read_commands(args.file))
 
-        if not commands:
+        if not commands and not args.variant and not args.from_corpus:
             print("Error: No docker run commands provided", file=sys.stderr)
             self.parser.print_help()
             sys.exit(1)
@@ -104,29 +223,70 @@ class CLI:
         try:
             from parser import DockerRunParser
             from generator import DockerComposeGenerator
+            from plugins import PluginRegistry
 
-            parser = DockerRunParser()
-            generator = DockerComposeGenerator(version=args.version)
+            limits = self._parse_limits(args)
+            parser = DockerRunParser(limits)
+            plugins = PluginRegistry.discover(args.plugins)
+            plugins.configure_parser(parser)
+            secret_detector = None
+            if args.extract_secrets:
+                from secret_detector import SecretDetector
+                secret_detector = SecretDetector(file_env=not args.secret_drop_env)
+            generator = DockerComposeGenerator(version=args.version, plugins=plugins,
+                                               output_format=args.format,
+                                               secret_detector=secret_detector,
+                                               max_output_bytes=limits.max_output_bytes)
 
-            parsed_list = []
-            for cmd in commands:
-                try:
-                    parsed = parser.parse(cmd)
-                    parsed_list.append(parsed)
-                except Exception as e:
-                    print(f"Warning: Failed to parse command: {cmd}", file=sys.stderr)
-                    print(f"  Error: {e}", file=sys.stderr)
+            if args.variant:
+                self._write_variants(generator, parser, args)
+                return
 
-            if not parsed_list:
-                print("Error: No valid docker run commands found", file=sys.stderr)
-                sys.exit(1)
+            if args.export_corpus:
+                self._export_corpus(parser, commands, args.export_corpus)
+                return
+
+            if args.from_corpus:
+                services, networks, volumes = self._map_corpus(generator, args)
+            elif args.jobs > 1:
+                services, networks, volumes = self._parse_parallel(generator, commands, args)
+            else:
+                parsed_list = self._parse_commands(parser, commands)
+
+                if not parsed_list:
+                    print("Error: No valid docker run commands found", file=sys.stderr)
+                    sys.exit(1)
+
+                services, networks, volumes = generator.collect_from_parsed(parsed_list)
+
+            if args.check_ports or args.remap_ports:
+                self._check_ports(services, args)
+
+            if secret_detector is not None and not args.check:
+                self._write_secrets(secret_detector, args)
+
+            # 其他目标先于 --extract-env 输出：env 文件只用于 compose，不改写 k8s/systemd 使用的服务定义
+            if not args.check:
+                targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+                self._write_targets([t for t in targets if t != 'compose'], services, networks, volumes, args)
+                if 'compose' not in targets:
+                    return
+
+            if args.extract_env:
+                self._extract_env(services, args)
 
-            output = generator.generate_from_parsed(parsed_list)
+            if args.check:
+                self._check(generator, services, networks, volumes, args.output or 'docker-compose.yml')
+                return
+
+            if args.shard_by:
+                self._write_sharded(generator, services, networks, volumes, args)
+                return
 
             if args.output:
                 try:
                     with open(args.output, 'w', encoding='utf-8') as f:
-                        f.write(output)
+                        generator.write(f, services, networks, volumes)
                     print(f"已成功生成 docker-compose.yml 文件：{args.output}")
                 except Exception as e:
                     print(f"Error writing to file: {e}", file=sys.stderr)
@@ -136,7 +296,9 @@ class CLI:
                     print("=" * 60)
                     print("Docker Compose Output")
                     print("=" * 60)
-                print(output)
+                generator.write(sys.stdout, services, networks, volumes)
+                if args.format != 'ndjson':
+                    print()
 
         except KeyboardInterrupt:
             print("\nInterrupted by user", file=sys.stderr)
@@ -145,44 +307,388 @@ class CLI:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
 
+    def _validate_args(self, args: argparse.Namespace) -> None:
+        targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+        if args.extract_secrets and any(t != 'compose' for t in targets):
+            # k8s / systemd 输出没有对应的 secret 挂载，变量会指向不存在的文件
+            print("Error: --extract-secrets only supports the compose target", file=sys.stderr)
+            sys.exit(1)
+
+        if args.variant:
+            # 变体模式只生成 compose 基础文件和覆盖文件
+            unsupported = [
+                ('commands / --file', args.commands or args.file),
+                ('--check', args.check),
+                ('--shard-by', args.shard_by),
+                ('--targets', any(t != 'compose' for t in targets)),
+                ('--extract-env', args.extract_env),
+                ('--jobs', args.jobs > 1),
+                ('--export-corpus', args.export_corpus),
+                ('--from-corpus', args.from_corpus),
+                ('--format ndjson', args.format == 'ndjson'),
+            ]
+            for option, used in unsupported:
+                if used:
+                    print(f"Error: {option} cannot be combined with --variant", file=sys.stderr)
+                    sys.exit(1)
+
+    def _read_commands(self, path: str) -> List[str]:
+        commands = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                # 智能识别多个 docker run 命令
+                # 找到所有 "docker run" 的位置
+                docker_run_positions = []
+                start = 0
+                while True:
+                    pos = content.find('docker run', start)
+                    if pos == -1:
+                        break
+                    docker_run_positions.append(pos)
+                    start = pos + 1
+
+                # 从每个 "docker run" 开始，到下一个 "docker run" 或文件结尾
+                for i, pos in enumerate(docker_run_positions):
+                    start_pos = pos
+                    if i + 1 < len(docker_run_positions):
+                        end_pos = docker_run_positions[i + 1]
+                    else:
+                        end_pos = len(content)
+
+                    command = content[start_pos:end_pos].strip()
+                    if command:
+                        commands.append(command)
+        except FileNotFoundError:
+            print(f"Error: File '{path}' not found", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
+            sys.exit(1)
+        return commands
+
+    def _parse_commands(self, parser, commands: List[str]) -> List:
+        parsed_list = []
+        for cmd in commands:
+            try:
+                parsed = parser.parse(cmd)
+                parsed_list.append(parsed)
+            except Exception as e:
+                print(f"Warning: Failed to parse command: {cmd}", file=sys.stderr)
+                print(f"  Error: {e}", file=sys.stderr)
+        return parsed_list
+
+    def _parse_limits(self, args: argparse.Namespace):
+        from parser import ParseLimits
+
+        limits = ParseLimits()
+        if args.max_command_length is not None:
+            limits.max_command_length = args.max_command_length
+        if args.max_tokens is not None:
+            limits.max_tokens = args.max_tokens
+        if args.max_flag_values is not None:
+            limits.max_values_per_flag = args.max_flag_values
+        if args.max_output_bytes is not None:
+            limits.max_output_bytes = args.max_output_bytes
+        return limits
+
+    def _export_corpus(self, parser, commands: List[str], path: str) -> None:
+        from corpus import export_corpus
+
+        parsed_list = self._parse_commands(parser, commands)
+        if not parsed_list:
+            print("Error: No valid docker run commands found", file=sys.stderr)
+            sys.exit(1)
+        try:
+            count = export_corpus(path, parsed_list)
+        except OSError as e:
+            print(f"Error writing to file: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"已成功导出 {count} 条命令到语料文件：{path}")
+
+    def _map_corpus(self, generator, args: argparse.Namespace):
+        from corpus import CorpusReader
+
+        try:
+            reader = CorpusReader(args.from_corpus)
+        except FileNotFoundError:
+            print(f"Error: File '{args.from_corpus}' not found", file=sys.stderr)
+            sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        with reader:
+            if not len(reader):
+                print("Error: No valid docker run commands found", file=sys.stderr)
+                sys.exit(1)
+            if args.jobs <= 1:
+                # 记录直接交给映射器，无需重新切分命令
+                return generator.collect_from_parsed(reader)
+
+            from parallel import map_corpus
+            results = map_corpus(args.from_corpus, len(reader), args.jobs, args.chunk_size, args.plugins)
+
+        mapped_list = []
+        for parsed, service, error in results:
+            if service is None:
+                raise ValueError(error)
+            mapped_list.append((parsed, service))
+        return generator.collect_from_mapped(mapped_list)
+
+    def _parse_parallel(self, generator, commands: List[str], args: argparse.Namespace):
+        from parallel import parse_and_map
+
+        results = parse_and_map(commands, args.jobs, args.chunk_size, args.plugins,
+                                self._parse_limits(args))
+
+        mapped_list = []
+        for cmd, (parsed, service, error) in zip(commands, results):
+            if parsed is None:
+                print(f"Warning: Failed to parse command: {cmd}", file=sys.stderr)
+                print(f"  Error: {error}", file=sys.stderr)
+            elif service is None:
+                raise ValueError(error)
+            else:
+                mapped_list.append((parsed, service))
+
+        if not mapped_list:
+            print("Error: No valid docker run commands found", file=sys.stderr)
+            sys.exit(1)
+
+        return generator.collect_from_mapped(mapped_list)
+
+    def _write_variants(self, generator, parser, args: argparse.Namespace) -> None:
+        from differ import ComposeDiffer
+        from generator import DockerComposeGenerator
+        from secret_detector import SecretDetector
+
+        variants = {}
+        detectors = {}
+        networks = {}
+        volumes = {}
+        for spec in args.variant:
+            env, sep, path = spec.partition('=')
+            if not sep or not env or not path:
+                print(f"Error: Invalid variant '{spec}', expected ENV=FILE", file=sys.stderr)
+                sys.exit(1)
+            parsed_list = self._parse_commands(parser, self._read_commands(path))
+            if not parsed_list:
+                print(f"Error: No valid docker run commands found in '{path}'", file=sys.stderr)
+                sys.exit(1)
+            # 每个变体单独提取 secrets，之后再统一命名，相同的 secret 才能进入基础文件
+            detector = SecretDetector(file_env=not args.secret_drop_env) if args.extract_secrets else None
+            variant_generator = DockerComposeGenerator(version=generator.version, plugins=generator.plugins,
+                                                       output_format=generator.output_format,
+                                                       secret_detector=detector,
+                                                       max_output_bytes=generator.max_output_bytes)
+            services, variant_networks, variant_volumes = variant_generator.collect_from_parsed(parsed_list)
+            if args.check_ports or args.remap_ports:
+                print(f"Checking ports for variant '{env}'", file=sys.stderr)
+                self._check_ports(services, args)
+            variants[env] = services
+            if detector is not None:
+                detectors[env] = detector
+            for name, config in variant_networks.items():
+                networks.setdefault(name, config)
+            for name, config in variant_volumes.items():
+                volumes.setdefault(name, config)
+
+        if args.extract_secrets:
+            generator.secret_detector = SecretDetector.merge_variants(detectors, variants)
+            self._write_secrets(generator.secret_detector, args)
+
+        base, overrides = ComposeDiffer().split_base(variants)
+
+        base_path = args.output or 'docker-compose.yml'
+        stem, extension = os.path.splitext(base_path)
+        outputs = [(base_path, base, networks, volumes)]
+        for env, services in overrides.items():
+            outputs.append((f"{stem}.{env}{extension or generator.file_extension()}", services, None, None))
+
+        for path, services, output_networks, output_volumes in outputs:
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    generator.write(f, services, output_networks, output_volumes)
+            except OSError as e:
+                print(f"Error writing to file: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"已成功生成 docker-compose 文件：{path}")
+
+    def _check_ports(self, services: Dict, args: argparse.Namespace) -> None:
+        from ports import PortConflictAnalyzer
+
+        analyzer = PortConflictAnalyzer()
+        conflicts = analyzer.find_conflicts(services)
+        for first, second in conflicts:
+            print(f"Warning: Host port conflict: {second.describe()} overlaps {first.describe()}", file=sys.stderr)
+
+        if not args.remap_ports or not conflicts:
+            return
+        if args.profile in ('prod', 'production'):
+            print(f"Warning: Not remapping ports for profile '{args.profile}'", file=sys.stderr)
+            return
+        for message in analyzer.remap(services, conflicts):
+            print(f"  {message}", file=sys.stderr)
+
+    def _write_secrets(self, secret_detector, args: argparse.Namespace) -> None:
+        output_dir = os.path.dirname(os.path.abspath(args.output)) if args.output else os.getcwd()
+        try:
+            secret_detector.write_files(output_dir)
+        except OSError as e:
+            print(f"Error writing to file: {e}", file=sys.stderr)
+            sys.exit(1)
+        for line in secret_detector.report():
+            print(line, file=sys.stderr)
+
+    def _extract_env(self, services: Dict, args: argparse.Namespace) -> None:
+        from env_files import SharedEnvExtractor
+
+        extractor = SharedEnvExtractor(min_keys=args.env_min_keys)
+        extractor.extract(services)
+        if args.check:
+            return
+
+        output_dir = os.path.dirname(os.path.abspath(args.output)) if args.output else os.getcwd()
+        try:
+            extractor.write_files(output_dir)
+        except OSError as e:
+            print(f"Error writing to file: {e}", file=sys.stderr)
+            sys.exit(1)
+        for line in extractor.report():
+            print(line, file=sys.stderr)
+
+    def _write_targets(self, targets: List[str], services: Dict, networks: Dict, volumes: Dict,
+                       args: argparse.Namespace) -> None:
+        from emitters import EMITTERS, SystemdEmitter
+
+        unknown = [t for t in targets if t not in EMITTERS]
+        if unknown:
+            print(f"Error: Unknown target(s): {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(1)
+
+        output_dir = os.path.dirname(os.path.abspath(args.output)) if args.output else os.getcwd()
+        # compose 输出到 stdout 时，提示信息改写到 stderr，避免混入 YAML
+        message_stream = sys.stdout if args.output else sys.stderr
+        for target in targets:
+            if EMITTERS[target] is SystemdEmitter:
+                emitter = SystemdEmitter(engine=args.systemd_engine)
+            else:
+                emitter = EMITTERS[target]()
+            try:
+                paths = emitter.emit(services, networks, volumes, output_dir)
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            except OSError as e:
+                print(f"Error writing to file: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"已成功生成 {target} 文件：{len(paths)} 个", file=message_stream)
+
+    def _check(self, generator, services: Dict, networks: Dict, volumes: Dict, path: str) -> None:
+        import yaml
+        from differ import ComposeDiffer
+
+        def load(file_path):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    return yaml.safe_load(f) or {}
+            except FileNotFoundError:
+                print(f"Error: File '{file_path}' not found", file=sys.stderr)
+                sys.exit(1)
+            except yaml.YAMLError as e:
+                print(f"Error reading file: {e}", file=sys.stderr)
+                sys.exit(1)
+
+        existing = load(path)
+        # 分片输出的根文件只有 include，按 compose 的方式把各分片合并后再比较
+        includes = existing.pop('include', None) if isinstance(existing, dict) else None
+        for entry in includes or []:
+            include_path = entry.get('path') if isinstance(entry, dict) else entry
+            shard = load(os.path.join(os.path.dirname(os.path.abspath(path)), include_path))
+            for key, value in shard.items():
+                if isinstance(value, dict):
+                    existing.setdefault(key, {}).update(value)
+
+        # 直接比较内存中的结构，不生成 YAML 文本
+        compose = generator.build(services, networks, volumes)
+        changes = ComposeDiffer().diff(existing, compose)
+        if changes:
+            print(f"{path} is out of date:")
+            for change in changes:
+                print(f"  {change}")
+            sys.exit(1)
+        print(f"{path} is up to date")
+
+    def _write_sharded(self, generator, services: Dict, networks: Dict, volumes: Dict,
+                       args: argparse.Namespace) -> None:
+        if not args.output:
+            print("Error: --shard-by requires --output", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            results = generator.write_sharded(
+                services, networks, volumes, args.output,
+                shard_by=args.shard_by,
+                shard_size=args.shard_size,
+                shard_label=args.shard_label
+            )
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error writing to file: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        changed = sum(1 for _, written in results if written)
+        print(f"已成功生成分片 docker-compose 文件：{args.output}（共 {len(results)} 个文件，更新 {changed} 个）")
+
     def interactive(self) -> None:
         print("Docker Run to Docker Compose Converter")
         print("=" * 50)
         print("Enter docker run commands (one per line)")
-        print("Enter an empty line to finish\n")
+        print("Each command is converted immediately; enter an empty line to finish\n")
 
         from parser import DockerRunParser
         from generator import DockerComposeGenerator
+        from plugins import PluginRegistry
 
         parser = DockerRunParser()
-        generator = DockerComposeGenerator()
+        plugins = PluginRegistry.discover()
+        plugins.configure_parser(parser)
+        generator = DockerComposeGenerator(plugins=plugins)
 
-        commands = []
+        services = {}
+        networks = {}
+        volumes = {}
         while True:
             try:
-                cmd = input(f"[{len(commands) + 1}] docker run ").strip()
-                if not cmd:
-                    break
-                if not cmd.startswith('docker run'):
-                    print("Error: Command must start with 'docker run'")
-                    continue
-                commands.append("docker run " + cmd)
-            except KeyboardInterrupt:
+                cmd = input(f"[{len(services) + 1}] docker run ").strip()
+            except (KeyboardInterrupt, EOFError):
                 print("\nInterrupted")
                 break
+            if not cmd:
+                break
+            if not cmd.startswith('docker run'):
+                cmd = "docker run " + cmd
 
-        if not commands:
+            # 每输入一行立即解析并映射，错误只影响当前行
+            try:
+                parsed = parser.parse(cmd)
+                if not parsed['image']:
+                    raise ValueError("No image specified")
+                fragment = generator.add_parsed(parsed, services, networks, volumes)
+            except Exception as e:
+                print(f"Error: {e}")
+                continue
+            print(fragment)
+
+        if not services:
             print("No commands provided")
             return
 
         print("\nGenerating docker-compose.yml...\n")
-
-        try:
-            parsed_list = [parser.parse(cmd) for cmd in commands]
-            output = generator.generate_from_parsed(parsed_list)
-            print(output)
-        except Exception as e:
-            print(f"Error: {e}")
+        print(generator.generate(services, networks, volumes))
 
 
 def main():
@@ -0,0 +1,194 @@
+import mmap
+import struct
+from typing import Dict, Iterator, List
+
+# 文件布局（小端）：
+#   header   magic(4) version(u16) reserved(u16) count(u32) flag_table_offset(u64) index_offset(u64)
+#   records  image(str) command(n + str*) params(n + (flag_id kind(u8) value)*)
+#   flags    n + str*，参数名只存一次，记录中用编号引用
+#   index    count * u64，每条记录的起始偏移，支持随机访问
+# n / flag_id 为 varint；str 为 varint(长度 + 1) 前缀的 UTF-8 字节，0 表示 None
+MAGIC = b'DRCC'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHIQQ')
+_U64 = struct.Struct('<Q')
+
+_KIND_FLAG = 0
+_KIND_VALUE = 1
+_KIND_LIST = 2
+
+
+class CorpusWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(b'\0' * _HEADER.size)
+        self._flags = {}
+        self._offsets = []
+
+    def __enter__(self) -> 'CorpusWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def write(self, parsed: Dict):
+        self._offsets.append(self._file.tell())
+        out = bytearray()
+        self._pack_str(out, parsed.get('image'))
+        command = parsed.get('command') or []
+        self._pack_varint(out, len(command))
+        for arg in command:
+            self._pack_str(out, arg)
+
+        params = parsed.get('params') or {}
+        self._pack_varint(out, len(params))
+        for name, value in params.items():
+            self._pack_varint(out, self._flags.setdefault(name, len(self._flags)))
+            if isinstance(value, list):
+                out.append(_KIND_LIST)
+                self._pack_varint(out, len(value))
+                for item in value:
+                    self._pack_str(out, item)
+            elif value is True:
+                out.append(_KIND_FLAG)
+            else:
+                out.append(_KIND_VALUE)
+                self._pack_str(out, value)
+        self._file.write(out)
+
+    def close(self):
+        flag_table_offset = self._file.tell()
+        out = bytearray()
+        self._pack_varint(out, len(self._flags))
+        for name in self._flags:
+            self._pack_str(out, name)
+        self._file.write(out)
+
+        index_offset = self._file.tell()
+        self._file.write(struct.pack(f"<{len(self._offsets)}Q", *self._offsets))
+
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, len(self._offsets), flag_table_offset, index_offset))
+        self._file.close()
+
+    def _pack_str(self, out: bytearray, value):
+        if value is None:
+            out.append(0)
+            return
+        data = str(value).encode('utf-8')
+        self._pack_varint(out, len(data) + 1)
+        out += data
+
+    def _pack_varint(self, out: bytearray, value: int):
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+class CorpusReader:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a docker run corpus file")
+        magic, version, _, self._count, flag_table_offset, self._index_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a docker run corpus file (version {VERSION})")
+
+        count, offset = self._read_varint(flag_table_offset)
+        self._flags = []
+        for _ in range(count):
+            name, offset = self._read_str(offset)
+            self._flags.append(name)
+
+    def __enter__(self) -> 'CorpusReader':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._count):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> Dict:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('corpus index out of range')
+        offset = _U64.unpack_from(self._mm, self._index_offset + i * _U64.size)[0]
+        return self._read_record(offset)
+
+    def close(self):
+        self._mm.close()
+
+    def _read_record(self, offset: int) -> Dict:
+        image, offset = self._read_str(offset)
+
+        count, offset = self._read_varint(offset)
+        command = []
+        for _ in range(count):
+            arg, offset = self._read_str(offset)
+            command.append(arg)
+
+        count, offset = self._read_varint(offset)
+        params = {}
+        for _ in range(count):
+            flag_id, offset = self._read_varint(offset)
+            kind = self._mm[offset]
+            offset += 1
+            if kind == _KIND_FLAG:
+                value = True
+            elif kind == _KIND_VALUE:
+                value, offset = self._read_str(offset)
+            else:
+                length, offset = self._read_varint(offset)
+                value = []
+                for _ in range(length):
+                    item, offset = self._read_str(offset)
+                    value.append(item)
+            params[self._flags[flag_id]] = value
+
+        return {'image': image, 'command': command, 'params': params}
+
+    def _read_str(self, offset: int):
+        length, offset = self._read_varint(offset)
+        if length == 0:
+            return None, offset
+        end = offset + length - 1
+        return self._mm[offset:end].decode('utf-8'), end
+
+    def _read_varint(self, offset: int):
+        byte = self._mm[offset]
+        offset += 1
+        # 绝大多数长度小于 128，单字节快速返回
+        if byte < 0x80:
+            return byte, offset
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            byte = self._mm[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, offset
+            shift += 7
+
+
+def export_corpus(path: str, parsed_list: List[Dict]) -> int:
+    with CorpusWriter(path) as writer:
+        for parsed in parsed_list:
+            writer.write(parsed)
+    return len(parsed_list)
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+_MISSING = object()
+# compose 覆盖文件中按元素合并（而不是整体替换）的列表
+_MERGED_LISTS = ('secrets',)
+
+
+class ComposeDiffer:
+    def __init__(self, max_value_length: int = 60):
+        self.max_value_length = max_value_length
+
+    def diff(self, existing: Dict, generated: Dict) -> List[str]:
+        existing = existing or {}
+        changes = []
+
+        for key in generated:
+            if key == 'services':
+                continue
+            difference = self._first_difference(existing.get(key), generated[key], key)
+            if difference:
+                changes.append(self._format(*difference))
+        for key in existing:
+            if key not in generated:
+                changes.append(f"- {key}")
+
+        existing_services = existing.get('services') or {}
+        generated_services = generated.get('services') or {}
+        for name, service in generated_services.items():
+            if name not in existing_services:
+                changes.append(f"+ services.{name}")
+                continue
+            # 每个服务只报告第一处差异
+            difference = self._first_difference(existing_services[name], service, f"services.{name}")
+            if difference:
+                changes.append(self._format(*difference))
+        for name in existing_services:
+            if name not in generated_services:
+                changes.append(f"- services.{name}")
+
+        return changes
+
+    def split_base(self, variants: Dict[str, Dict]) -> Tuple[Dict, Dict[str, Dict]]:
+        # 所有变体中都存在且相同的部分进入基础文件，其余按变体写入覆盖文件；
+        # 每个键只访问一次，代价与键的总数成线性关系
+        envs = list(variants)
+        service_names = {}
+        for env in envs:
+            for name in variants[env]:
+                service_names.setdefault(name, None)
+
+        base = {}
+        overrides = {env: {} for env in envs}
+        for name in service_names:
+            services = [variants[env].get(name) for env in envs]
+            if any(service is None for service in services):
+                # 只在部分环境中存在的服务整体放进对应的覆盖文件
+                for env, service in zip(envs, services):
+                    if service is not None:
+                        overrides[env][name] = service
+                continue
+            common, differences = self._split_mapping(services)
+            base[name] = common
+            for env, difference in zip(envs, differences):
+                if difference:
+                    overrides[env][name] = difference
+        return base, overrides
+
+    def _split_mapping(self, mappings: List[Dict]) -> Tuple[Dict, List[Dict]]:
+        common = {}
+        differences = [{} for _ in mappings]
+
+        keys = {}
+        for mapping in mappings:
+            for key in mapping:
+                keys.setdefault(key, None)
+
+        for key in keys:
+            values = [mapping.get(key, _MISSING) for mapping in mappings]
+            if all(value is not _MISSING for value in values):
+                # compose 覆盖文件会递归合并映射，但列表和标量是整体替换或追加，
+                # 所以只有映射可以拆分；其他值必须在所有变体中完全相同才能进入基础文件
+                if all(isinstance(value, dict) for value in values):
+                    sub_common, sub_differences = self._split_mapping(values)
+                    # 都是空映射（如 networks: {mynet: {}}）时也要保留这个键
+                    if sub_common or not any(sub_differences):
+                        common[key] = sub_common
+                    for difference, sub_difference in zip(differences, sub_differences):
+                        if sub_difference:
+                            difference[key] = sub_difference
+                    continue
+                if all(value == values[0] for value in values[1:]):
+                    common[key] = values[0]
+                    continue
+                if key in _MERGED_LISTS and all(isinstance(value, list) for value in values):
+                    shared = set(values[0]).intersection(*values[1:])
+                    if shared:
+                        common[key] = [item for item in values[0] if item in shared]
+                    for difference, value in zip(differences, values):
+                        extra = [item for item in value if item not in shared]
+                        if extra:
+                            difference[key] = extra
+                    continue
+            for difference, value in zip(differences, values):
+                if value is not _MISSING:
+                    difference[key] = value
+        return common, differences
+
+    def _first_difference(self, old: Any, new: Any, path: str) -> Optional[Tuple[str, Any, Any]]:
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key, value in new.items():
+                if key not in old:
+                    return f"{path}.{key}", None, value
+                difference = self._first_difference(old[key], value, f"{path}.{key}")
+                if difference:
+                    return difference
+            for key in old:
+                if key not in new:
+                    return f"{path}.{key}", old[key], None
+            return None
+
+        if isinstance(old, list) and isinstance(new, list):
+            if len(old) != len(new):
+                return path, old, new
+            for index, (old_item, new_item) in enumerate(zip(old, new)):
+                difference = self._first_difference(old_item, new_item, f"{path}[{index}]")
+                if difference:
+                    return difference
+            return None
+
+        if old != new or type(old) is not type(new):
+            return path, old, new
+        return None
+
+    def _format(self, path: str, old: Any, new: Any) -> str:
+        if old is None:
+            return f"+ {path}: {self._short(new)}"
+        if new is None:
+            return f"- {path}: {self._short(old)}"
+        return f"~ {path}: {self._short(old)} -> {self._short(new)}"
+
+    def _short(self, value: Any) -> str:
+        text = repr(value)
+        if len(text) > self.max_value_length:
+            text = text[:self.max_value_length - 3] + '...'
+        return text
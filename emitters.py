@@ -0,0 +1,287 @@
+import os
+import re
+import shlex
+import yaml
+from typing import Dict, List, Optional, Tuple
+
+
+class KubernetesEmitter:
+    def __init__(self, filename: str = 'kubernetes.yml'):
+        self.filename = filename
+
+    def emit(self, services: Dict, networks: Dict, volumes: Dict, output_dir: str) -> List[str]:
+        documents = []
+        claims = []
+        for name, service in services.items():
+            documents.extend(self.service_documents(name, service))
+            for pod_volume in self._volumes(service)[0]:
+                claim = pod_volume.get('persistentVolumeClaim', {}).get('claimName')
+                if claim and claim not in claims:
+                    claims.append(claim)
+        # 命名卷对应的 PVC 放在最前面，Deployment 创建时即可绑定
+        documents[:0] = [self.claim_document(claim) for claim in claims]
+
+        path = os.path.join(output_dir, self.filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump_all(documents, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        return [path]
+
+    def claim_document(self, claim: str) -> Dict:
+        return {
+            'apiVersion': 'v1',
+            'kind': 'PersistentVolumeClaim',
+            'metadata': {'name': claim},
+            'spec': {
+                'accessModes': ['ReadWriteOnce'],
+                'resources': {'requests': {'storage': '1Gi'}},
+            },
+        }
+
+    def service_documents(self, name: str, service: Dict) -> List[Dict]:
+        k8s_name = self._k8s_name(name)
+
+        container = {'name': k8s_name, 'image': _image(name, service)}
+        entrypoint = service.get('entrypoint')
+        if entrypoint:
+            container['command'] = [str(c) for c in entrypoint]
+        if service.get('command'):
+            container['args'] = [str(c) for c in service['command']]
+        if service.get('working_dir'):
+            container['workingDir'] = service['working_dir']
+
+        ports = self._ports(service)
+        container_ports = []
+        for _, target, protocol in ports:
+            container_ports.append({'containerPort': target, 'protocol': protocol})
+        for exposed in service.get('expose') or []:
+            if isinstance(exposed, int) and all(p['containerPort'] != exposed for p in container_ports):
+                container_ports.append({'containerPort': exposed, 'protocol': 'TCP'})
+        if container_ports:
+            container['ports'] = container_ports
+
+        environment = service.get('environment') or {}
+        if environment:
+            container['env'] = [{'name': k, 'value': str(v)} for k, v in environment.items()]
+
+        limits = (service.get('deploy') or {}).get('resources', {}).get('limits') or {}
+        if limits:
+            resources = {}
+            if 'memory' in limits:
+                resources['memory'] = self._k8s_memory(limits['memory'])
+            if 'cpus' in limits:
+                resources['cpu'] = str(limits['cpus'])
+            container['resources'] = {'limits': resources}
+
+        security_context = {}
+        if service.get('privileged'):
+            security_context['privileged'] = True
+        if service.get('read_only'):
+            security_context['readOnlyRootFilesystem'] = True
+        if str(service.get('user', '')).isdigit():
+            security_context['runAsUser'] = int(service['user'])
+        if security_context:
+            container['securityContext'] = security_context
+
+        pod_volumes, mounts = self._volumes(service)
+        if mounts:
+            container['volumeMounts'] = mounts
+
+        pod_spec = {'containers': [container]}
+        if service.get('hostname'):
+            pod_spec['hostname'] = service['hostname']
+        if pod_volumes:
+            pod_spec['volumes'] = pod_volumes
+
+        documents = [{
+            'apiVersion': 'apps/v1',
+            'kind': 'Deployment',
+            'metadata': {'name': k8s_name, 'labels': {'app': k8s_name}},
+            'spec': {
+                'replicas': 1,
+                'selector': {'matchLabels': {'app': k8s_name}},
+                'template': {'metadata': {'labels': {'app': k8s_name}}, 'spec': pod_spec},
+            },
+        }]
+
+        published = [(p, t, proto) for p, t, proto in ports if p is not None]
+        if published:
+            documents.append({
+                'apiVersion': 'v1',
+                'kind': 'Service',
+                'metadata': {'name': k8s_name, 'labels': {'app': k8s_name}},
+                'spec': {
+                    'selector': {'app': k8s_name},
+                    'ports': [
+                        {'name': f"{proto.lower()}-{p}", 'port': p, 'targetPort': t, 'protocol': proto}
+                        for p, t, proto in published
+                    ],
+                },
+            })
+        return documents
+
+    def _ports(self, service: Dict) -> List[Tuple[Optional[int], int, str]]:
+        # 只转换单个端口，端口范围在 Kubernetes 中没有对应写法
+        result = []
+        for port in service.get('ports') or []:
+            spec, _, protocol = str(port).partition('/')
+            parts = spec.split(':')
+            target = parts[-1]
+            published = parts[-2] if len(parts) >= 2 else None
+            if not target.isdigit() or (published is not None and not published.isdigit()):
+                continue
+            result.append((int(published) if published else None, int(target), (protocol or 'tcp').upper()))
+        return result
+
+    def _volumes(self, service: Dict) -> Tuple[List[Dict], List[Dict]]:
+        pod_volumes = []
+        mounts = []
+        for index, volume in enumerate(service.get('volumes') or []):
+            if not isinstance(volume, str) or ':' not in volume:
+                continue
+            parts = volume.split(':')
+            source, target = parts[0], parts[1]
+            volume_name = f"vol-{index}"
+            if source.startswith('/'):
+                pod_volumes.append({'name': volume_name, 'hostPath': {'path': source}})
+            elif source.startswith('.') or source.startswith('~'):
+                # 相对路径的绑定挂载无法映射到集群节点
+                continue
+            else:
+                pod_volumes.append({'name': volume_name,
+                                    'persistentVolumeClaim': {'claimName': self._k8s_name(source)}})
+            mount = {'name': volume_name, 'mountPath': target}
+            if len(parts) > 2 and 'ro' in parts[2].split(','):
+                mount['readOnly'] = True
+            mounts.append(mount)
+        return pod_volumes, mounts
+
+    def _k8s_name(self, name: str) -> str:
+        k8s_name = re.sub(r'[^a-z0-9-]', '-', str(name).lower()).strip('-')
+        return k8s_name[:63].rstrip('-') or 'service'
+
+    def _k8s_memory(self, memory: str) -> str:
+        match = re.fullmatch(r'(\d+)([bkmg]?)b?', str(memory).lower())
+        if not match:
+            return str(memory)
+        value, unit = match.groups()
+        return value + {'': '', 'b': '', 'k': 'Ki', 'm': 'Mi', 'g': 'Gi'}[unit]
+
+
+class SystemdEmitter:
+    def __init__(self, engine: str = 'podman', directory: str = 'systemd'):
+        self.engine = engine
+        self.directory = directory
+
+    def emit(self, services: Dict, networks: Dict, volumes: Dict, output_dir: str) -> List[str]:
+        unit_dir = os.path.join(output_dir, self.directory)
+        os.makedirs(unit_dir, exist_ok=True)
+
+        paths = []
+        for name, service in services.items():
+            path = os.path.join(unit_dir, f"{self._unit_name(name)}.service")
+            unit = self.unit(name, service, os.path.abspath(output_dir))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(unit)
+            paths.append(path)
+        return paths
+
+    def unit(self, name: str, service: Dict, base_dir: Optional[str] = None) -> str:
+        _image(name, service)
+        container_name = service.get('container_name', name)
+        engine = f"/usr/bin/{self.engine}"
+        restart_map = {'always': 'always', 'unless-stopped': 'always', 'on-failure': 'on-failure', 'no': 'no'}
+
+        lines = [
+            '[Unit]',
+            f"Description={name} container",
+            'Wants=network-online.target',
+            'After=network-online.target',
+            '',
+            '[Service]',
+        ]
+        restart = restart_map.get(service.get('restart'))
+        if restart:
+            lines.append(f"Restart={restart}")
+        lines.append(f"ExecStartPre=-{engine} rm -f {self._quote(container_name)}")
+        lines.append(f"ExecStart={self._command_line(engine, container_name, service, base_dir)}")
+        lines.append(f"ExecStop={engine} stop {self._quote(container_name)}")
+        lines.extend([
+            '',
+            '[Install]',
+            'WantedBy=multi-user.target',
+            '',
+        ])
+        return '\n'.join(lines)
+
+    def _command_line(self, engine: str, container_name: str, service: Dict,
+                      base_dir: Optional[str] = None) -> str:
+        args = [engine, 'run', '--rm', '--name', container_name]
+
+        if service.get('hostname'):
+            args += ['--hostname', service['hostname']]
+        for port in service.get('ports') or []:
+            args += ['-p', str(port)]
+        for key, value in (service.get('environment') or {}).items():
+            args += ['-e', f"{key}={value}"]
+        for env_file in service.get('env_file') or []:
+            args += ['--env-file', self._absolute(env_file, base_dir)]
+        for volume in service.get('volumes') or []:
+            if isinstance(volume, str):
+                source, sep, rest = volume.partition(':')
+                if sep and source.startswith('.'):
+                    volume = f"{self._absolute(source, base_dir)}:{rest}"
+                args += ['-v', volume]
+        for network in service.get('networks') or {}:
+            args += ['--network', network]
+        if service.get('user'):
+            args += ['--user', str(service['user'])]
+        if service.get('working_dir'):
+            args += ['--workdir', service['working_dir']]
+        if service.get('privileged'):
+            args.append('--privileged')
+        if service.get('read_only'):
+            args.append('--read-only')
+        for cap in service.get('cap_add') or []:
+            args += ['--cap-add', cap]
+        for cap in service.get('cap_drop') or []:
+            args += ['--cap-drop', cap]
+        limits = (service.get('deploy') or {}).get('resources', {}).get('limits') or {}
+        if 'memory' in limits:
+            args += ['--memory', str(limits['memory'])]
+        if 'cpus' in limits:
+            args += ['--cpus', str(limits['cpus'])]
+
+        # --entrypoint 只接受一个可执行文件，其余部分放到镜像名之后
+        entrypoint = list(service.get('entrypoint') or [])
+        if entrypoint:
+            args += ['--entrypoint', str(entrypoint[0])]
+        args.append(service['image'])
+        args += [str(a) for a in entrypoint[1:]]
+        args += [str(a) for a in service.get('command') or []]
+
+        return ' '.join(self._quote(arg) for arg in args)
+
+    def _absolute(self, path: str, base_dir: Optional[str]) -> str:
+        # systemd 单元的工作目录是 /，相对路径按输出目录（compose 文件所在目录）解析
+        if base_dir is None or os.path.isabs(path) or path.startswith('~'):
+            return path
+        return os.path.normpath(os.path.join(base_dir, path))
+
+    def _quote(self, value: str) -> str:
+        # systemd 会展开 % 和 $，需要转义
+        return shlex.quote(str(value)).replace('%', '%%').replace('$', '$$')
+
+    def _unit_name(self, name: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.@-]', '_', str(name)) or 'service'
+
+
+def _image(name: str, service: Dict) -> str:
+    if not service.get('image'):
+        raise ValueError(f"Service '{name}' has no image")
+    return service['image']
+
+
+EMITTERS = {
+    'k8s': KubernetesEmitter,
+    'systemd': SystemdEmitter,
+}
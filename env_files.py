@@ -0,0 +1,103 @@
+import hashlib
+import os
+import re
+import yaml
+from typing import Dict, List, Optional
+
+_PLAIN_VALUE = re.compile(r'[A-Za-z0-9_./:@,+=%-]*')
+
+
+class SharedEnvExtractor:
+    def __init__(self, env_dir: str = 'env', min_keys: int = 3, min_services: int = 2):
+        self.env_dir = env_dir
+        self.min_keys = min_keys
+        self.min_services = min_services
+        self.files = {}
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def extract(self, services: Dict) -> Dict[str, str]:
+        # 先记录每个键值对出现在哪些服务中，再按这组服务（frozenset）分组：
+        # 同一组里的键值对恰好被同一批服务共享，可以合并成一个 env 文件
+        pair_services = {}
+        for name, service in services.items():
+            for pair in (service.get('environment') or {}).items():
+                if self._env_line(*pair) is not None:
+                    pair_services.setdefault(pair, []).append(name)
+
+        blocks = {}
+        for pair, names in pair_services.items():
+            if len(names) >= self.min_services:
+                blocks.setdefault(frozenset(names), []).append(pair)
+
+        affected = {}
+        for names, pairs in blocks.items():
+            if len(pairs) < self.min_keys:
+                continue
+            content = ''.join(self._env_line(k, v) for k, v in pairs)
+            digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]
+            filename = f"shared-{digest}.env"
+            # 只有 env 文件加上各服务的 env_file 引用比原来内联的 YAML 更小时才抽取
+            reference = len(f"    env_file:\n    - ./{self.env_dir}/{filename}\n".encode('utf-8'))
+            cost = len(content.encode('utf-8')) + reference * len(names)
+            if cost >= self._inline_size(pairs) * len(names):
+                continue
+            self.files[filename] = content
+            for name in names:
+                affected.setdefault(name, []).append((filename, pairs))
+
+        for name in services:
+            if name not in affected:
+                continue
+            service = services[name]
+            self.bytes_before += self._fragment_size(name, service)
+            environment = service['environment']
+            env_files = service.get('env_file') or []
+            for filename, pairs in affected[name]:
+                for key, _ in pairs:
+                    del environment[key]
+                env_files.append(f"./{self.env_dir}/{filename}")
+            service['env_file'] = env_files
+            if not environment:
+                del service['environment']
+            self.bytes_after += self._fragment_size(name, service)
+
+        self.bytes_after += sum(len(content.encode('utf-8')) for content in self.files.values())
+        return self.files
+
+    def write_files(self, output_dir: str) -> List[str]:
+        if not self.files:
+            return []
+        env_dir = os.path.join(output_dir, self.env_dir)
+        os.makedirs(env_dir, exist_ok=True)
+        paths = []
+        for filename, content in self.files.items():
+            path = os.path.join(env_dir, filename)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+    def report(self) -> List[str]:
+        saved = self.bytes_before - self.bytes_after
+        return [f"Extracted {len(self.files)} shared env file(s), "
+                f"{saved} bytes saved ({self.bytes_before} -> {self.bytes_after})"]
+
+    def _env_line(self, key: str, value) -> Optional[str]:
+        value = str(value)
+        if _PLAIN_VALUE.fullmatch(value):
+            return f"{key}={value}\n"
+        # 单引号内的值不会被转义或插值；含 $（需要 compose 插值）、单引号或换行的值保留在 environment 中
+        if '$' in value or "'" in value or '\n' in value or '\r' in value:
+            return None
+        return f"{key}='{value}'\n"
+
+    def _inline_size(self, pairs: List) -> int:
+        # environment 下每行缩进 6 个空格
+        dumped = yaml.dump(dict(pairs), default_flow_style=False, sort_keys=False, allow_unicode=True)
+        return len(dumped.encode('utf-8')) + 6 * len(pairs)
+
+    def _fragment_size(self, name: str, service: Dict) -> int:
+        fragment = {'services': {name: {k: service[k] for k in ('environment', 'env_file') if k in service}}}
+        return len(yaml.dump(fragment, default_flow_style=False, sort_keys=False,
+                             allow_unicode=True).encode('utf-8'))
@@ -1,12 +1,66 @@
+import json
+import os
+import re
 import yaml
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+OUTPUT_FORMATS = ('yaml', 'json', 'ndjson')
 
 
 class DockerComposeGenerator:
-    def __init__(self, version: str = '3.9'):
+    def __init__(self, version: str = '3.9', plugins=None, output_format: str = 'yaml',
+                 secret_detector=None, max_output_bytes: Optional[int] = None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
         self.version = version
+        self.plugins = plugins
+        self.output_format = output_format
+        self.secret_detector = secret_detector
+        self.max_output_bytes = max_output_bytes
+        self._mapper = None
 
     def generate(self, services: Dict, networks: Dict = None, volumes: Dict = None) -> str:
+        return ''.join(self.iter_output(services, networks, volumes))
+
+    def write(self, fp, services: Dict, networks: Dict = None, volumes: Dict = None):
+        for chunk in self.iter_output(services, networks, volumes):
+            fp.write(chunk)
+
+    def iter_output(self, services: Dict, networks: Dict = None, volumes: Dict = None):
+        chunks = self._iter_chunks(services, networks, volumes)
+        if self.max_output_bytes is None:
+            yield from chunks
+            return
+
+        # 输出过程中累计字节数，超限立即停止，不必先生成完整结果
+        total = 0
+        for chunk in chunks:
+            total += len(chunk.encode('utf-8'))
+            if total > self.max_output_bytes:
+                raise ValueError(f"Output exceeds {self.max_output_bytes} bytes")
+            yield chunk
+
+    def _iter_chunks(self, services: Dict, networks: Dict = None, volumes: Dict = None):
+        if self.output_format == 'ndjson':
+            # 每行一个服务，便于日志管道逐行处理
+            for name, service in services.items():
+                yield json.dumps({'name': name, 'service': service}, ensure_ascii=False) + '\n'
+            return
+
+        compose = self.build(services, networks, volumes)
+        if self.output_format == 'json':
+            # JSON 直接由标准库编码器分块输出，完全跳过 YAML
+            yield from json.JSONEncoder(ensure_ascii=False).iterencode(compose)
+            return
+
+        yield self._with_header(self._dump_yaml(compose))
+
+    def file_extension(self) -> str:
+        return '.yml' if self.output_format == 'yaml' else f".{self.output_format}"
+
+    def build(self, services: Dict, networks: Dict = None, volumes: Dict = None) -> Dict:
         compose = {'version': self.version, 'services': services}
 
         if networks:
@@ -16,8 +70,14 @@ class DockerComposeGenerator:
         if volumes:
             compose['volumes'] = volumes
 
-        yaml_str = self._dump_yaml(compose)
+        if self.secret_detector is not None:
+            secrets = self.secret_detector.top_level(services)
+            if secrets:
+                compose['secrets'] = secrets
+
+        return compose
 
+    def _with_header(self, yaml_str: str) -> str:
         # 添加中文注释
         lines = yaml_str.split('\n')
         result = []
@@ -49,52 +109,237 @@ class DockerComposeGenerator:
             compose['volumes'][volume_name] = {}
 
     def generate_from_parsed(self, parsed_list: List[Dict]) -> str:
+        services, networks, volumes = self.collect_from_parsed(parsed_list)
+        return self.generate(services, networks, volumes)
+
+    def collect_from_parsed(self, parsed_list: List[Dict]) -> Tuple[Dict, Dict, Dict]:
         services = {}
         networks = {}
         volumes = {}
 
         for parsed in parsed_list:
-            params = parsed.get('params', {})
-            service_name = params.get('name', f"service_{len(services) + 1}")
-
-            if 'network' in params:
-                network_name = params['network']
-                if network_name not in networks:
-                    networks[network_name] = {'driver': 'bridge'}
-
-            if 'volume' in params:
-                from parser import DockerRunParser
-                parser = DockerRunParser()
-                for vol_str in params['volume']:
-                    parsed_vol = parser.parse_volume(vol_str)
-                    if parsed_vol['type'] == 'volume' and 'source' in parsed_vol:
-                        volume_name = parsed_vol['source']
-                        if volume_name not in volumes:
-                            volumes[volume_name] = {}
-
-        for i, parsed in enumerate(parsed_list):
-            params = parsed.get('params', {})
-            if 'name' in params:
-                service_name = params['name']
+            self._add_parsed(parsed, services, networks, volumes)
+
+        return services, networks, volumes
+
+    def collect_from_mapped(self, mapped_list: List[Tuple[Dict, Dict]]) -> Tuple[Dict, Dict, Dict]:
+        # 服务已在其他进程中映射完成，这里只按输入顺序确定服务名并收集 networks / volumes
+        services = {}
+        networks = {}
+        volumes = {}
+
+        for parsed, service in mapped_list:
+            self._add_parsed(parsed, services, networks, volumes, service)
+
+        return services, networks, volumes
+
+    def add_parsed(self, parsed: Dict, services: Dict, networks: Dict, volumes: Dict) -> str:
+        # 增量模式：只渲染新服务的片段，以及有变化的顶层 networks / volumes
+        known_networks = len(networks)
+        known_volumes = len(volumes)
+        service_name = self._add_parsed(parsed, services, networks, volumes)
+
+        fragment = {'services': {service_name: services[service_name]}}
+        if len(networks) != known_networks:
+            fragment['networks'] = networks
+        if len(volumes) != known_volumes:
+            fragment['volumes'] = volumes
+        return self._dump_yaml(fragment)
+
+    def _add_parsed(self, parsed: Dict, services: Dict, networks: Dict, volumes: Dict,
+                    service: Optional[Dict] = None) -> str:
+        # 先完成映射，失败时不会留下半截的 networks / volumes
+        if service is None:
+            service = self._generate_service_dict(parsed)
+        self._collect_resources(parsed, networks, volumes)
+        service_name = self._service_name(parsed, services)
+        if self.secret_detector is not None:
+            self.secret_detector.extract(service_name, service)
+        services[service_name] = service
+        return service_name
+
+    def _collect_resources(self, parsed: Dict, networks: Dict, volumes: Dict):
+        params = parsed.get('params', {})
+
+        if 'network' in params:
+            network_name = params['network']
+            if network_name not in networks:
+                networks[network_name] = {'driver': 'bridge'}
+
+        if 'volume' in params:
+            from parser import DockerRunParser
+            parser = DockerRunParser()
+            for vol_str in params['volume']:
+                parsed_vol = parser.parse_volume(vol_str)
+                if parsed_vol['type'] == 'volume' and 'source' in parsed_vol:
+                    volume_name = parsed_vol['source']
+                    if volume_name not in volumes:
+                        volumes[volume_name] = {}
+
+    def _service_name(self, parsed: Dict, services: Dict) -> str:
+        params = parsed.get('params', {})
+        if 'name' in params:
+            return params['name']
+
+        # 从镜像名中提取服务名
+        image_name = parsed.get('image') or ''
+        if '/' in image_name:
+            # 处理带命名空间的镜像，如 library/nginx 或 myuser/myapp
+            image_name = image_name.split('/')[-1]
+        if ':' in image_name:
+            service_name = image_name.split(':')[0]
+        else:
+            service_name = image_name
+        # 如果还是空的，使用默认名称
+        if not service_name:
+            service_name = f"service_{len(services) + 1}"
+        return service_name
+
+    def write_sharded(self, services: Dict, networks: Dict, volumes: Dict, output: str,
+                      shard_by: str = 'size', shard_size: Optional[int] = None,
+                      shard_label: Optional[str] = None,
+                      max_workers: Optional[int] = None) -> List[Tuple[str, bool]]:
+        if self.output_format == 'ndjson':
+            raise ValueError("Sharded output does not support the ndjson format")
+        shards = self._partition_services(services, shard_by, shard_size, shard_label)
+        extension = self.file_extension()
+
+        root_dir = os.path.dirname(os.path.abspath(output))
+        shard_dir_name = os.path.splitext(os.path.basename(output))[0] + '.d'
+        shard_dir = os.path.join(root_dir, shard_dir_name)
+        os.makedirs(shard_dir, exist_ok=True)
+
+        previous = self._previous_shards(output, shard_dir_name)
+
+        jobs = []
+        for shard_name, shard_services in shards.items():
+            path = os.path.join(shard_dir, f"{shard_name}{extension}")
+            jobs.append((path, shard_services))
+
+        def render_and_write(job):
+            path, shard_services = job
+            shard_networks, shard_volumes = self._shard_resources(shard_services, networks, volumes)
+            content = self.generate(shard_services, shard_networks, shard_volumes)
+            return path, self._write_if_changed(path, content)
+
+        # yaml.dump 受 GIL 限制，线程只让各分片的文件读写互相重叠，渲染本身仍是串行的
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(render_and_write, jobs))
+
+        # 只删除上一次根文件 include 过、这次不再需要的分片，目录中其他文件一律保留
+        current = {os.path.basename(path) for path, _ in jobs}
+        for entry in sorted(previous - current):
+            try:
+                os.remove(os.path.join(shard_dir, entry))
+            except FileNotFoundError:
+                pass
+
+        root = {
+            'version': self.version,
+            # project_directory 让分片中的相对路径（绑定挂载、env_file、secrets）仍以根目录为基准
+            'include': [
+                {'path': f"{shard_dir_name}/{os.path.basename(path)}", 'project_directory': '.'}
+                for path, _ in jobs
+            ],
+        }
+        if self.output_format == 'json':
+            root_content = json.dumps(root, ensure_ascii=False)
+        else:
+            root_content = self._with_header(self._dump_yaml(root))
+        results.append((output, self._write_if_changed(output, root_content)))
+        return results
+
+    def _previous_shards(self, output: str, shard_dir_name: str) -> set:
+        try:
+            with open(output, 'r', encoding='utf-8') as f:
+                root = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError):
+            return set()
+        if not isinstance(root, dict):
+            return set()
+
+        shards = set()
+        prefix = f"{shard_dir_name}/"
+        for entry in root.get('include') or []:
+            path = entry.get('path') if isinstance(entry, dict) else entry
+            # 只认本工具写出的形式：<输出名>.d/<文件名>，不含子目录
+            name = path[len(prefix):] if isinstance(path, str) and path.startswith(prefix) else ''
+            if name not in ('', '.', '..') and '/' not in name:
+                shards.add(name)
+        return shards
+
+    def _partition_services(self, services: Dict, shard_by: str, shard_size: Optional[int],
+                            shard_label: Optional[str]) -> Dict[str, Dict]:
+        if shard_by not in ('network', 'label', 'size'):
+            raise ValueError(f"Unknown shard mode: {shard_by}")
+        if shard_by == 'label' and not shard_label:
+            raise ValueError("Sharding by label requires a label key")
+        if shard_size is not None and shard_size < 1:
+            raise ValueError("Shard size must be a positive integer")
+        if shard_by == 'size' and not shard_size:
+            raise ValueError("Sharding by size requires a shard size")
+
+        groups = {}
+        for name, service in services.items():
+            if shard_by == 'network':
+                key = next(iter(service.get('networks') or {}), 'default')
+            elif shard_by == 'label':
+                key = self._label_value(service.get('labels'), shard_label) or 'unlabelled'
             else:
-                # 从镜像名中提取服务名
-                image_name = parsed.get('image', '')
-                if '/' in image_name:
-                    # 处理带命名空间的镜像，如 library/nginx 或 myuser/myapp
-                    image_name = image_name.split('/')[-1]
-                if ':' in image_name:
-                    service_name = image_name.split(':')[0]
-                else:
-                    service_name = image_name
-                # 如果还是空的，使用默认名称
-                if not service_name:
-                    service_name = f"service_{len(services) + 1}"
-
-            services[service_name] = self._generate_service_dict(parsed)
+                key = 'services'
+            groups.setdefault(self._shard_file_name(key), {})[name] = service
 
-        return self.generate(services, networks, volumes)
+        if not shard_size:
+            return groups
+
+        # 超出大小上限的分组继续拆分：第一个分片保持原名，其余依次编号，
+        # 这样分组增长时已有分片的文件名不会变化
+        shards = {}
+        for key, group in groups.items():
+            names = list(group)
+            for index in range(0, len(names), shard_size):
+                shard_name = key if index == 0 else f"{key}-{index // shard_size + 1}"
+                shards[shard_name] = {name: group[name] for name in names[index:index + shard_size]}
+        return shards
+
+    def _label_value(self, labels, key: str) -> Optional[str]:
+        if isinstance(labels, dict):
+            return labels.get(key)
+        for label in labels or []:
+            if isinstance(label, dict) and key in label:
+                return label[key]
+        return None
+
+    def _shard_file_name(self, key: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', str(key)) or 'default'
+
+    def _shard_resources(self, services: Dict, networks: Dict, volumes: Dict) -> Tuple[Dict, Dict]:
+        used_networks = set()
+        used_volumes = set()
+        for service in services.values():
+            used_networks.update(service.get('networks') or {})
+            for volume in service.get('volumes') or []:
+                if isinstance(volume, str):
+                    used_volumes.add(volume.split(':', 1)[0])
+                elif isinstance(volume, dict) and 'source' in volume:
+                    used_volumes.add(volume['source'])
+        shard_networks = {k: v for k, v in networks.items() if k in used_networks}
+        shard_volumes = {k: v for k, v in volumes.items() if k in used_volumes}
+        return shard_networks, shard_volumes
+
+    def _write_if_changed(self, path: str, content: str) -> bool:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return False
+        except FileNotFoundError:
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True
 
     def _generate_service_dict(self, parsed: Dict) -> Dict:
-        from mapper import DockerComposeMapper
-        mapper = DockerComposeMapper()
-        return mapper.map_to_service(parsed)
+        if self._mapper is None:
+            from mapper import DockerComposeMapper
+            self._mapper = DockerComposeMapper(plugins=self.plugins)
+        return self._mapper.map_to_service(parsed)
@@ -3,8 +3,10 @@ from parser import DockerRunParser
 
 
 class DockerComposeMapper:
-    def __init__(self):
+    def __init__(self, plugins=None):
         self.parser = DockerRunParser()
+        # 没有插件时保持 None，映射主循环不做任何额外检查
+        self.plugins = plugins if plugins else None
 
     def map_to_service(self, parsed: Dict) -> Dict:
         service = {}
@@ -264,6 +266,9 @@ class DockerComposeMapper:
         if 'group_add' in params:
             service['group_add'] = params['group_add']
 
+        if self.plugins is not None:
+            self.plugins.apply(service, parsed)
+
         return self._clean_service(service)
 
     def _parse_command(self, cmd_str: str) -> List[str]:
@@ -291,6 +296,8 @@ class DockerComposeMapper:
 
         if 'published' in parsed:
             result = f"{parsed['published']}:{parsed['target']}"
+            if parsed.get('host_ip'):
+                result = f"{parsed['host_ip']}:{result}"
         else:
             result = parsed['target']
 
@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# 每个工作进程只初始化一次解析器和映射器（含参数表和插件）
+_parser = None
+_mapper = None
+
+
+def _init_worker(plugins_config: Optional[str] = None, limits=None):
+    global _parser, _mapper
+    from parser import DockerRunParser
+    from mapper import DockerComposeMapper
+    from plugins import PluginRegistry
+
+    plugins = PluginRegistry.discover(plugins_config)
+    _parser = DockerRunParser(limits)
+    plugins.configure_parser(_parser)
+    _mapper = DockerComposeMapper(plugins=plugins)
+
+
+def _process_chunk(commands: List[str]) -> List[Tuple[Optional[Dict], Optional[Dict], Optional[str]]]:
+    results = []
+    for cmd in commands:
+        try:
+            parsed = _parser.parse(cmd)
+        except Exception as e:
+            results.append((None, None, str(e)))
+            continue
+        try:
+            service = _mapper.map_to_service(parsed)
+        except Exception as e:
+            # 映射失败在合并阶段按串行模式的方式整体报错
+            results.append((parsed, None, str(e)))
+            continue
+        results.append((parsed, service, None))
+    return results
+
+
+def _process_corpus_range(task: Tuple[str, int, int]) -> List[Tuple[Optional[Dict], Optional[Dict], Optional[str]]]:
+    from corpus import CorpusReader
+
+    path, start, end = task
+    results = []
+    # 每个任务只映射自己的记录区间，mmap 按需读取，不需要在进程间传递原始命令
+    with CorpusReader(path) as reader:
+        for i in range(start, end):
+            parsed = reader[i]
+            try:
+                results.append((parsed, _mapper.map_to_service(parsed), None))
+            except Exception as e:
+                results.append((parsed, None, str(e)))
+    return results
+
+
+def map_corpus(path: str, count: int, jobs: int, chunk_size: Optional[int] = None,
+               plugins_config: Optional[str] = None) -> List[Tuple[Optional[Dict], Optional[Dict], Optional[str]]]:
+    if not chunk_size:
+        chunk_size = max(1, min(1000, count // (jobs * 4) or 1))
+    tasks = [(path, i, min(i + chunk_size, count)) for i in range(0, count, chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(plugins_config,)) as executor:
+        for chunk_results in executor.map(_process_corpus_range, tasks):
+            results.extend(chunk_results)
+    return results
+
+
+def parse_and_map(commands: List[str], jobs: int, chunk_size: Optional[int] = None,
+                  plugins_config: Optional[str] = None,
+                  limits=None) -> List[Tuple[Optional[Dict], Optional[Dict], Optional[str]]]:
+    if not chunk_size:
+        chunk_size = max(1, min(1000, len(commands) // (jobs * 4) or 1))
+    chunks = [commands[i:i + chunk_size] for i in range(0, len(commands), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(plugins_config, limits)) as executor:
+        # executor.map 按提交顺序返回结果，合并后与输入顺序一致
+        for chunk_results in executor.map(_process_chunk, chunks):
+            results.extend(chunk_results)
+    return results
@@ -1,10 +1,36 @@
-import shlex
 import re
 from typing import Dict, List, Optional, Tuple
 
+# 与 shlex.split(posix=True) 相同的切分规则，但每个片段由正则一次匹配，
+# 总耗时与命令长度成线性关系（shlex 逐字符拼接 token，长 token 会退化为平方级）
+_TOKEN_PIECE = re.compile(r"""
+    (?P<space>[ \t\r\n]+)
+  | (?P<word>[^ \t\r\n'"\\]+)
+  | '(?P<single>[^']*)'
+  | "(?P<double>[^"\\]*(?:\\.[^"\\]*)*)"
+  | \\(?P<escaped>.)
+""", re.VERBOSE | re.DOTALL)
+_DOUBLE_QUOTE_ESCAPE = re.compile(r'\\(["\\])')
+
+
+class ParseLimitError(ValueError):
+    pass
+
+
+class ParseLimits:
+    def __init__(self, max_command_length: Optional[int] = 256 * 1024,
+                 max_tokens: Optional[int] = 20000,
+                 max_values_per_flag: Optional[int] = 5000,
+                 max_output_bytes: Optional[int] = None):
+        self.max_command_length = max_command_length
+        self.max_tokens = max_tokens
+        self.max_values_per_flag = max_values_per_flag
+        self.max_output_bytes = max_output_bytes
+
 
 class DockerRunParser:
-    def __init__(self):
+    def __init__(self, limits: Optional[ParseLimits] = None):
+        self.limits = limits or ParseLimits()
         self.param_mapping = {
             '-a': 'attach',
             '--attach': 'attach',
@@ -128,20 +154,37 @@ class DockerRunParser:
             '--quiet': 'quiet',
             '--use-api-socket': 'use_api_socket',
         }
+        self.bool_params = frozenset([
+            'detach', 'interactive', 'tty', 'privileged', 'read_only',
+            'rm', 'init', 'no_healthcheck', 'oom_kill_disable', 'publish_all',
+            'disable_content_trust', 'sig_proxy'
+        ])
+        self.multi_value_params = frozenset([
+            'attach', 'add_host', 'annotation', 'cap_add', 'cap_drop', 'device', 'dns',
+            'dns_option', 'dns_search', 'env', 'env_file', 'expose',
+            'group_add', 'gpus', 'label', 'link', 'log_opt', 'mount', 'network_alias',
+            'publish', 'security_opt', 'sysctl', 'tmpfs', 'ulimit', 'volume'
+        ])
 
     def parse(self, command: str) -> Dict:
         if not command.startswith('docker run'):
             raise ValueError("Command must start with 'docker run'")
 
+        max_length = self.limits.max_command_length
+        if max_length is not None and len(command) > max_length:
+            raise ParseLimitError(f"Command exceeds {max_length} characters")
+
         # 处理反斜杠续行符
         command = command.replace('\\\n', ' ').replace('\\\r\n', ' ')
 
         try:
-            args = shlex.split(command)
+            args = self.split(command)
+        except ParseLimitError:
+            raise
         except ValueError:
-            # 如果shlex.split失败，尝试手动清理反斜杠
+            # 如果切分失败，尝试手动清理反斜杠
             command = re.sub(r'\\\s*$', '', command, flags=re.MULTILINE)
-            args = shlex.split(command)
+            args = self.split(command)
 
         args = args[2:]
 
@@ -179,29 +222,64 @@ class DockerRunParser:
 
         return result
 
+    def split(self, command: str) -> List[str]:
+        max_tokens = self.limits.max_tokens
+        tokens = []
+        pieces = []
+        in_token = False
+        pos = 0
+        length = len(command)
+
+        while pos < length:
+            match = _TOKEN_PIECE.match(command, pos)
+            if match is None:
+                # 未闭合的双引号若以单个反斜杠结尾，shlex 报告的是转义错误
+                trailing = len(command) - len(command.rstrip('\\'))
+                if command[pos] == '\\' or (command[pos] == '"' and trailing % 2):
+                    raise ValueError("No escaped character")
+                raise ValueError("No closing quotation")
+            pos = match.end()
+            kind = match.lastgroup
+
+            if kind == 'space':
+                if in_token:
+                    tokens.append(''.join(pieces))
+                    pieces = []
+                    in_token = False
+                    # 边切分边检查，超限时不再扫描剩余输入
+                    if max_tokens is not None and len(tokens) > max_tokens:
+                        raise ParseLimitError(f"Command exceeds {max_tokens} tokens")
+                continue
+
+            in_token = True
+            if kind == 'double':
+                pieces.append(_DOUBLE_QUOTE_ESCAPE.sub(r'\1', match.group(kind)))
+            else:
+                pieces.append(match.group(kind))
+
+        if in_token:
+            tokens.append(''.join(pieces))
+            if max_tokens is not None and len(tokens) > max_tokens:
+                raise ParseLimitError(f"Command exceeds {max_tokens} tokens")
+        return tokens
+
     def _get_param_name(self, param_key: str) -> str:
         return self.param_mapping.get(param_key, param_key.lstrip('-'))
 
     def _is_bool_param(self, param_name: str) -> bool:
-        bool_params = [
-            'detach', 'interactive', 'tty', 'privileged', 'read_only',
-            'rm', 'init', 'no_healthcheck', 'oom_kill_disable', 'publish_all',
-            'disable_content_trust', 'sig_proxy'
-        ]
-        return param_name in bool_params
+        return param_name in self.bool_params
 
     def _add_param(self, result: Dict, param_name: str, value: str):
-        multi_value_params = [
-            'attach', 'add_host', 'annotation', 'cap_add', 'cap_drop', 'device', 'dns',
-            'dns_option', 'dns_search', 'env', 'env_file', 'expose',
-            'group_add', 'gpus', 'label', 'link', 'log_opt', 'mount', 'network_alias',
-            'publish', 'security_opt', 'sysctl', 'tmpfs', 'ulimit', 'volume'
-        ]
-
-        if param_name in multi_value_params:
-            if param_name not in result['params']:
-                result['params'][param_name] = []
-            result['params'][param_name].append(value)
+        if param_name in self.multi_value_params:
+            values = result['params'].get(param_name)
+            # 之前出现过不带值的同名参数（记为 True）时，从空列表开始
+            if not isinstance(values, list):
+                values = result['params'][param_name] = []
+            # 取值个数在组装 params 时检查，split() 只负责词数上限
+            max_values = self.limits.max_values_per_flag
+            if max_values is not None and len(values) >= max_values:
+                raise ParseLimitError(f"Too many values for '{param_name}' (limit {max_values})")
+            values.append(value)
         else:
             result['params'][param_name] = value
 
@@ -0,0 +1,140 @@
+import importlib
+from typing import Callable, Dict, List, Optional
+
+ENTRY_POINT_GROUP = 'docker_run_to_compose.plugins'
+
+
+class Plugin:
+    def __init__(self, target: str, flags: List[str] = None):
+        self.target = target
+        self.flags = [_normalize_flag(f) for f in flags or []]
+        self.flag_handlers = []
+        self.service_hooks = []
+        self.loaded = False
+
+    def add_flag_handler(self, flag: str, handler: Callable):
+        self.flag_handlers.append((_normalize_flag(flag), handler))
+
+    def add_service_hook(self, hook: Callable):
+        self.service_hooks.append(hook)
+
+    def load(self):
+        if self.loaded:
+            return
+        module_name, _, attr = self.target.partition(':')
+        try:
+            module = importlib.import_module(module_name)
+            register = getattr(module, attr or 'register')
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Failed to load plugin '{self.target}': {e}")
+        register(self)
+        self.loaded = True
+
+
+class PluginRegistry:
+    def __init__(self):
+        self._by_flag = {}
+        self._global = []
+        self._plugins = {}
+        self.flags = frozenset()
+        self.bool_flags = frozenset()
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+    @classmethod
+    def discover(cls, config_path: Optional[str] = None) -> 'PluginRegistry':
+        registry = cls()
+        registry.load_entry_points()
+        if config_path:
+            registry.load_config(config_path)
+        return registry
+
+    def declare(self, target: str, flags: List[str] = None):
+        # 只登记插件负责的参数，真正 import 推迟到某条命令用到这些参数时。
+        # '--flag:bool' 表示该参数不带值，解析时不会吞掉下一个词
+        plugin = self._plugins.get(target)
+        if plugin is None:
+            plugin = self._plugins[target] = Plugin(target)
+        new_flags = []
+        for declared in flags or []:
+            flag, _, kind = str(declared).partition(':')
+            if kind not in ('', 'bool'):
+                raise ValueError(f"Invalid flag declaration for plugin '{target}': {declared!r}")
+            new_flags.append(_normalize_flag(flag))
+            if kind == 'bool' and flag != '*':
+                self.bool_flags = self.bool_flags | {new_flags[-1]}
+        if not new_flags or '*' in new_flags:
+            if plugin not in self._global:
+                self._global.append(plugin)
+            return
+        for flag in new_flags:
+            if flag not in plugin.flags:
+                plugin.flags.append(flag)
+            self._by_flag.setdefault(flag, [])
+            if plugin not in self._by_flag[flag]:
+                self._by_flag[flag].append(plugin)
+        self.flags = frozenset(self._by_flag)
+
+    def configure_parser(self, parser):
+        # 插件声明的无值参数加入解析器的布尔参数表，必须在解析命令之前调用
+        if self.bool_flags:
+            parser.bool_params = parser.bool_params | self.bool_flags
+
+    def load_entry_points(self):
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        eps = entry_points()
+        if hasattr(eps, 'select'):
+            eps = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(ENTRY_POINT_GROUP, [])
+        # 入口点名称即参数名（'*' 表示对所有服务生效），读取元数据不会 import 插件
+        for ep in eps:
+            self.declare(ep.value, [ep.name])
+
+    def load_config(self, path: str):
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        for entry in config.get('plugins') or []:
+            if isinstance(entry, str):
+                self.declare(entry)
+            elif isinstance(entry, dict) and 'module' in entry:
+                self.declare(entry['module'], entry.get('flags'))
+            else:
+                raise ValueError(f"Invalid plugin entry in {path}: {entry!r}")
+
+    def apply(self, service: Dict, parsed: Dict):
+        params = parsed.get('params', {})
+
+        plugins = list(self._global)
+        for flag in self.flags.intersection(params):
+            for plugin in self._by_flag[flag]:
+                if plugin not in plugins:
+                    plugins.append(plugin)
+
+        for plugin in plugins:
+            plugin.load()
+            for flag, handler in plugin.flag_handlers:
+                if flag in params:
+                    handler(service, params[flag], parsed)
+            for hook in plugin.service_hooks:
+                hook(service, parsed)
+
+
+_parser = None
+
+
+def _normalize_flag(flag: str) -> str:
+    # 命令行写法（'--log-driver'、'-e'、'--my-flag'）按解析器的规则换算成 params 中的键名，
+    # 已经是键名的（'log_driver'、'*'）原样使用
+    global _parser
+    if not flag.startswith('-'):
+        return flag
+    if _parser is None:
+        from parser import DockerRunParser
+        _parser = DockerRunParser()
+    return _parser._get_param_name(flag)
@@ -0,0 +1,155 @@
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+WILDCARD_IPS = ('', '0.0.0.0', '::')
+MAX_PORT = 65535
+
+
+class PublishedPort:
+    def __init__(self, service: str, index: int, host_ip: str, start: int, end: int,
+                 target: str, protocol: str):
+        self.service = service
+        self.index = index
+        self.host_ip = host_ip
+        self.start = start
+        self.end = end
+        self.target = target
+        self.protocol = protocol
+
+    def host_range(self) -> str:
+        return str(self.start) if self.start == self.end else f"{self.start}-{self.end}"
+
+    def describe(self) -> str:
+        host_ip = self.host_ip or '0.0.0.0'
+        return f"{self.service} {host_ip}:{self.host_range()}/{self.protocol}"
+
+    def to_port(self) -> str:
+        result = f"{self.host_range()}:{self.target}"
+        if self.host_ip:
+            result = f"{self.host_ip}:{result}"
+        if self.protocol != 'tcp':
+            result += f"/{self.protocol}"
+        return result
+
+
+class PortConflictAnalyzer:
+    def index(self, services: Dict) -> List[PublishedPort]:
+        ports = []
+        for name, service in services.items():
+            for index, port in enumerate(service.get('ports') or []):
+                published = self._parse_port(name, index, port)
+                if published is not None:
+                    ports.append(published)
+        return ports
+
+    def find_conflicts(self, services: Dict) -> List[Tuple[PublishedPort, PublishedPort]]:
+        # 按 (协议, 起始端口) 排序后扫描。每个具体 IP 单独维护一个堆，通配地址另有一个堆，
+        # 再用一个堆汇总所有具体 IP 供通配端口比较；弹出过期区间后堆中剩下的都与当前区间冲突，
+        # 不同 IP 的端口互不比较，总代价 O(n log n + 冲突数)
+        ports = sorted(self.index(services), key=lambda p: (p.protocol, p.start, p.end))
+        conflicts = []
+        protocol = None
+        for order, port in enumerate(ports):
+            if port.protocol != protocol:
+                protocol = port.protocol
+                by_ip = {}
+                wildcard = []
+                specific = []
+            if port.host_ip in WILDCARD_IPS:
+                candidates = (wildcard, specific)
+            else:
+                candidates = (by_ip.setdefault(port.host_ip, []), wildcard)
+            for active in candidates:
+                while active and active[0][0] < port.start:
+                    heapq.heappop(active)
+                conflicts.extend((other, port) for _, _, other in active)
+            entry = (port.end, order, port)
+            if port.host_ip in WILDCARD_IPS:
+                heapq.heappush(wildcard, entry)
+            else:
+                heapq.heappush(candidates[0], entry)
+                heapq.heappush(specific, entry)
+        # 按服务出现顺序报告，结果稳定
+        service_order = {name: i for i, name in enumerate(services)}
+        conflicts.sort(key=lambda c: (service_order[c[1].service], c[1].index,
+                                      service_order[c[0].service], c[0].index))
+        return conflicts
+
+    def remap(self, services: Dict, conflicts: List[Tuple[PublishedPort, PublishedPort]]) -> List[str]:
+        if not conflicts:
+            return []
+
+        occupied = {}
+        for port in self.index(services):
+            occupied.setdefault(port.protocol, []).append((port.start, port.end))
+        for protocol in occupied:
+            occupied[protocol] = self._merge(occupied[protocol])
+
+        messages = []
+        remapped = set()
+        for _, port in conflicts:
+            key = (port.service, port.index)
+            if key in remapped:
+                continue
+            remapped.add(key)
+            width = port.end - port.start
+            start = self._find_free(occupied.setdefault(port.protocol, []), port.start, width)
+            if start is None:
+                messages.append(f"Could not find a free host port for {port.describe()}")
+                continue
+            old = port.describe()
+            port.start, port.end = start, start + width
+            services[port.service]['ports'][port.index] = port.to_port()
+            occupied[port.protocol] = self._merge(occupied[port.protocol] + [(port.start, port.end)])
+            messages.append(f"Remapped {old} -> {port.host_range()}")
+        return messages
+
+    def _parse_port(self, service: str, index: int, port) -> Optional[PublishedPort]:
+        if not isinstance(port, str):
+            return None
+        spec, _, protocol = port.partition('/')
+        parts = spec.split(':')
+        if len(parts) == 2:
+            host_ip, published, target = '', parts[0], parts[1]
+        elif len(parts) == 3:
+            host_ip, published, target = parts
+        else:
+            return None
+        # 未指定宿主机端口时由 docker 随机分配，不会冲突
+        if not published:
+            return None
+        start, _, end = published.partition('-')
+        if not start.isdigit() or (end and not end.isdigit()):
+            return None
+        start = int(start)
+        end = int(end) if end else start
+        return PublishedPort(service, index, host_ip, start, end, target, protocol or 'tcp')
+
+    def _merge(self, intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _find_free(self, occupied: List[Tuple[int, int]], start: int, width: int) -> Optional[int]:
+        # occupied 为已合并的有序区间，从冲突端口开始向上寻找第一个足够宽的空隙
+        candidate = start
+        position = bisect_left(occupied, (candidate, candidate))
+        if position > 0 and occupied[position - 1][1] >= candidate:
+            position -= 1
+        while position < len(occupied):
+            occupied_start, occupied_end = occupied[position]
+            if occupied_end < candidate:
+                position += 1
+                continue
+            if occupied_start > candidate + width:
+                break
+            candidate = occupied_end + 1
+            position += 1
+        if candidate + width > MAX_PORT:
+            return None
+        return candidate
@@ -0,0 +1,145 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 所有规则编译进同一个正则：每个环境变量的键和值各只匹配一次，
+# 命中哪条规则由命名分组 lastgroup 给出。键名规则必须是完整的单词
+# （前后为 _ 或键名边界），避免 BYPASS_*、PASSENGER_*、COMPASS 之类误判
+KEY_RULES = [
+    ('password', r'PASS(?:WORD|WD)?'),
+    ('secret', r'SECRET'),
+    ('token', r'TOKEN'),
+    ('api_key', r'API_?KEY'),
+    ('access_key', r'ACCESS_?KEY'),
+    ('private_key', r'PRIVATE_?KEY'),
+    ('credentials', r'CREDENTIALS?'),
+    ('auth', r'AUTH(?:_?KEY)?$'),
+]
+
+VALUE_RULES = [
+    ('aws_access_key', r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b'),
+    ('github_token', r'\bgh[pousr]_[A-Za-z0-9]{36,}'),
+    ('slack_token', r'\bxox[abprs]-[A-Za-z0-9-]{10,}'),
+    ('private_key_block', r'-----BEGIN [A-Z ]*PRIVATE KEY-----'),
+    ('jwt', r'\beyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]+'),
+    ('url_credentials', r'://[^/\s:@]+:[^/\s@]+@'),
+]
+
+
+def _combine(rules: List[Tuple[str, str]], flags: int = 0, whole_words: bool = False):
+    if whole_words:
+        rules = [(name, f"(?<![A-Za-z0-9])(?:{pattern})(?![A-Za-z0-9])") for name, pattern in rules]
+    return re.compile('|'.join(f"(?P<{name}>{pattern})" for name, pattern in rules), flags)
+
+
+class SecretDetector:
+    def __init__(self, secrets_dir: str = 'secrets', file_env: bool = True):
+        self.secrets_dir = secrets_dir
+        self.file_env = file_env
+        self.key_matcher = _combine(KEY_RULES, re.IGNORECASE, whole_words=True)
+        self.value_matcher = _combine(VALUE_RULES)
+        self.extracted = {}
+
+    def detect(self, key: str, value) -> Optional[str]:
+        if value is None or value == '' or key.upper().endswith('_FILE'):
+            return None
+        value = str(value)
+        # ${VAR} 引用本身不是明文凭据
+        if value.startswith('${') and value.endswith('}'):
+            return None
+        match = self.key_matcher.search(key) or self.value_matcher.search(value)
+        return match.lastgroup if match else None
+
+    def extract(self, service_name: str, service: Dict):
+        environment = service.get('environment')
+        if not environment:
+            return
+
+        for key in list(environment):
+            rule = self.detect(key, environment[key])
+            if rule is None:
+                continue
+            secret_name = self._secret_name(service_name, key)
+            self.extracted[secret_name] = {
+                'service': service_name,
+                'key': key,
+                'env_key': f"{key}_FILE" if self.file_env else None,
+                'rule': rule,
+                'value': str(environment[key]),
+            }
+            # 默认改写成 <KEY>_FILE 约定；file_env=False 时直接删除变量，由镜像自行读取
+            # /run/secrets 下的文件。不能把路径写进原变量，否则路径本身会被当成凭据
+            del environment[key]
+            if self.file_env:
+                environment[f"{key}_FILE"] = f"/run/secrets/{secret_name}"
+            service.setdefault('secrets', []).append(secret_name)
+        if not environment:
+            del service['environment']
+
+    @classmethod
+    def merge_variants(cls, detectors: Dict[str, 'SecretDetector'], variants: Dict[str, Dict]) -> 'SecretDetector':
+        # 各变体中同名且值相同的 secret 共用一个文件；值不同时按变体重命名，
+        # 避免基础文件引用同一个名字却对应不同内容
+        first = next(iter(detectors.values()), None)
+        merged = cls(secrets_dir=first.secrets_dir, file_env=first.file_env) if first else cls()
+
+        values = {}
+        for detector in detectors.values():
+            for secret_name, secret in detector.extracted.items():
+                values.setdefault(secret_name, set()).add(secret['value'])
+
+        for env, detector in detectors.items():
+            for secret_name, secret in detector.extracted.items():
+                final_name = secret_name
+                if len(values[secret_name]) > 1:
+                    final_name = re.sub(r'[^a-z0-9_.-]', '_', f"{secret_name}_{env}".lower())
+                    service = variants[env][secret['service']]
+                    service['secrets'] = [final_name if s == secret_name else s for s in service['secrets']]
+                    if secret['env_key']:
+                        service['environment'][secret['env_key']] = f"/run/secrets/{final_name}"
+                merged.extracted.setdefault(final_name, secret)
+        return merged
+
+    def top_level(self, services: Dict) -> Dict:
+        used = {}
+        for service in services.values():
+            for secret_name in service.get('secrets') or []:
+                if secret_name in self.extracted:
+                    used[secret_name] = {'file': f"./{self.secrets_dir}/{secret_name}"}
+        return used
+
+    def write_files(self, output_dir: str) -> List[str]:
+        secrets_dir = os.path.join(output_dir, self.secrets_dir)
+        os.makedirs(secrets_dir, exist_ok=True)
+        paths = []
+        for secret_name, secret in self.extracted.items():
+            path = os.path.join(secrets_dir, secret_name)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(secret['value'])
+            paths.append(path)
+        return paths
+
+    def report(self) -> List[str]:
+        services = {secret['service'] for secret in self.extracted.values()}
+        lines = [f"Extracted {len(self.extracted)} secret(s) from {len(services)} service(s)"]
+        for secret_name, secret in self.extracted.items():
+            target = f"as {secret['env_key']}" if secret['env_key'] else 'variable removed'
+            lines.append(f"  {secret['service']}.{secret['key']} -> {self.secrets_dir}/{secret_name} "
+                         f"{target} ({secret['rule']})")
+        if self.extracted and not self.file_env:
+            lines.append(f"Warning: {len(self.extracted)} variable(s) removed; the images must read "
+                         f"/run/secrets/<name> themselves")
+        if self.extracted:
+            lines.append(f"Note: files in {self.secrets_dir}/ are mode 0600 and compose mounts them unchanged; "
+                         f"containers running as another uid cannot read them")
+        return lines
+
+    def _secret_name(self, service_name: str, key: str) -> str:
+        name = re.sub(r'[^a-z0-9_.-]', '_', f"{service_name}_{key}".lower())
+        candidate = name
+        index = 2
+        while candidate in self.extracted:
+            candidate = f"{name}_{index}"
+            index += 1
+        return candidate
@@ -0,0 +1,25 @@
+import pytest
+
+from cli import CLI
+
+COMMANDS = [
+    'docker run -d --name web --network front -p 80:80 nginx',
+    'docker run -d --name api --network back node',
+    'docker run -d --name db --network back mysql',
+]
+
+
+def test_check_follows_sharded_includes(tmp_path, capsys):
+    output = str(tmp_path / 'compose.yml')
+    CLI().run(COMMANDS + ['--shard-by', 'network', '-o', output])
+    capsys.readouterr()
+
+    CLI().run(COMMANDS + ['-o', output, '--check'])
+    assert capsys.readouterr().out == f"{output} is up to date\n"
+
+    shard = tmp_path / 'compose.d' / 'front.yml'
+    shard.write_text(shard.read_text(encoding='utf-8').replace('image: nginx', 'image: nginx:1'), encoding='utf-8')
+    with pytest.raises(SystemExit) as exit_info:
+        CLI().run(COMMANDS + ['-o', output, '--check'])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().out == f"{output} is out of date:\n  ~ services.web.image: 'nginx:1' -> 'nginx'\n"
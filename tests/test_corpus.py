@@ -0,0 +1,54 @@
+import pytest
+
+from corpus import CorpusReader, export_corpus
+from parser import DockerRunParser
+
+
+def _records():
+    parser = DockerRunParser()
+    records = [
+        parser.parse('docker run -d --name web -p 80:80 -p 443:443 -e A=1 nginx:latest nginx -g "daemon off;"'),
+        {'image': None, 'command': [], 'params': {'rm': True, 'name': None}},
+        {'image': '镜像', 'command': ['ünï', ''], 'params': {'env': [], 'label': ['k=值']}},
+        # 多字节 varint：长度超过 127 / 16383 的值，编号超过 127 的参数
+        {'image': 'x' * 200, 'command': ['y' * 20000], 'params': {f"flag-{i}": str(i) for i in range(300)}},
+    ]
+    return records
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'corpus.drc')
+    records = _records()
+    assert export_corpus(path, records) == len(records)
+
+    with CorpusReader(path) as reader:
+        assert len(reader) == len(records)
+        assert list(reader) == records
+
+
+def test_random_access(tmp_path):
+    path = str(tmp_path / 'corpus.drc')
+    records = _records()
+    export_corpus(path, records)
+
+    with CorpusReader(path) as reader:
+        for i in (3, 0, 2, 1, -1, -4):
+            assert reader[i] == records[i]
+        for i in (4, -5):
+            with pytest.raises(IndexError):
+                reader[i]
+
+
+def test_empty_corpus(tmp_path):
+    path = str(tmp_path / 'empty.drc')
+    assert export_corpus(path, []) == 0
+    with CorpusReader(path) as reader:
+        assert len(reader) == 0
+        assert list(reader) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'commands.txt'
+    path.write_text('docker run nginx' * 4, encoding='utf-8')
+    with pytest.raises(ValueError, match='is not a docker run corpus file'):
+        CorpusReader(str(path))
@@ -0,0 +1,68 @@
+from differ import ComposeDiffer
+from secret_detector import SecretDetector
+
+
+def test_split_base_keeps_equal_values_in_base():
+    base, overrides = ComposeDiffer().split_base({
+        'dev': {'app': {'image': 'node:14', 'environment': {'TZ': 'UTC', 'NODE_ENV': 'dev'}, 'networks': {'n': {}}}},
+        'prod': {'app': {'image': 'node:14', 'environment': {'TZ': 'UTC', 'NODE_ENV': 'prod'}, 'networks': {'n': {}}}},
+    })
+
+    assert base == {'app': {'image': 'node:14', 'environment': {'TZ': 'UTC'}, 'networks': {'n': {}}}}
+    assert overrides == {
+        'dev': {'app': {'environment': {'NODE_ENV': 'dev'}}},
+        'prod': {'app': {'environment': {'NODE_ENV': 'prod'}}},
+    }
+
+
+def test_variant_secrets_share_equal_values():
+    variants = {}
+    detectors = {}
+    for env, token in (('dev', 'd1'), ('prod', 'p1')):
+        detector = SecretDetector()
+        service = {'image': 'mysql:8', 'environment': {'MYSQL_ROOT_PASSWORD': 'same', 'API_TOKEN': token}}
+        detector.extract('db', service)
+        variants[env] = {'db': service}
+        detectors[env] = detector
+
+    merged = SecretDetector.merge_variants(detectors, variants)
+    base, overrides = ComposeDiffer().split_base(variants)
+
+    assert set(merged.extracted) == {'db_mysql_root_password', 'db_api_token_dev', 'db_api_token_prod'}
+    assert base['db']['secrets'] == ['db_mysql_root_password']
+    assert base['db']['environment'] == {'MYSQL_ROOT_PASSWORD_FILE': '/run/secrets/db_mysql_root_password'}
+    assert overrides['prod']['db']['secrets'] == ['db_api_token_prod']
+    assert overrides['prod']['db']['environment'] == {'API_TOKEN_FILE': '/run/secrets/db_api_token_prod'}
+
+
+def test_diff_reports_first_difference_per_service():
+    existing = {'version': '3.9', 'services': {
+        'web': {'image': 'nginx:1', 'ports': ['80:80'], 'restart': 'always'},
+        'old': {'image': 'redis'},
+    }}
+    generated = {'version': '3.9', 'services': {
+        'web': {'image': 'nginx', 'ports': ['8080:80'], 'restart': 'no'},
+        'api': {'image': 'node'},
+    }}
+
+    assert ComposeDiffer().diff(existing, generated) == [
+        "~ services.web.image: 'nginx:1' -> 'nginx'",
+        '+ services.api',
+        '- services.old',
+    ]
+
+
+def test_diff_reports_top_level_keys():
+    existing = {'version': '3.8', 'services': {}, 'configs': {'c': {}}}
+    generated = {'version': '3.9', 'services': {}, 'volumes': {'data': {}}}
+
+    assert ComposeDiffer().diff(existing, generated) == [
+        "~ version: '3.8' -> '3.9'",
+        "+ volumes: {'data': {}}",
+        '- configs',
+    ]
+
+
+def test_diff_of_equal_files_is_empty():
+    compose = {'version': '3.9', 'services': {'web': {'image': 'nginx', 'environment': {'A': '1'}}}}
+    assert ComposeDiffer().diff(compose, {'version': '3.9', 'services': {'web': {'image': 'nginx', 'environment': {'A': '1'}}}}) == []
@@ -0,0 +1,35 @@
+import pytest
+
+from emitters import KubernetesEmitter, SystemdEmitter
+
+
+def test_k8s_emits_claims_for_named_volumes(tmp_path):
+    import yaml
+
+    services = {
+        'db': {'image': 'postgres', 'volumes': ['pgdata:/var/lib/postgresql/data']},
+        'backup': {'image': 'alpine', 'volumes': ['pgdata:/data:ro', '/srv:/srv']},
+    }
+    [path] = KubernetesEmitter().emit(services, {}, {'pgdata': {}}, str(tmp_path))
+
+    with open(path, encoding='utf-8') as f:
+        documents = list(yaml.safe_load_all(f))
+    claims = [d['metadata']['name'] for d in documents if d['kind'] == 'PersistentVolumeClaim']
+    assert claims == ['pgdata']
+    assert documents[0]['kind'] == 'PersistentVolumeClaim'
+
+
+def test_systemd_resolves_relative_paths_against_output_dir():
+    service = {'image': 'nginx', 'volumes': ['./html:/usr/share/nginx/html:ro', 'cache:/cache'],
+               'env_file': ['./web.env']}
+    unit = SystemdEmitter().unit('web', service, '/srv/app')
+
+    assert '-v /srv/app/html:/usr/share/nginx/html:ro' in unit
+    assert '-v cache:/cache' in unit
+    assert '--env-file /srv/app/web.env' in unit
+
+
+@pytest.mark.parametrize('emitter', [KubernetesEmitter(), SystemdEmitter()])
+def test_missing_image_is_reported(emitter, tmp_path):
+    with pytest.raises(ValueError, match="Service 'x' has no image"):
+        emitter.emit({'x': {'ports': ['80:80']}}, {}, {}, str(tmp_path))
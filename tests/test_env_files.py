@@ -0,0 +1,30 @@
+from env_files import SharedEnvExtractor
+
+
+def _services(count, environment):
+    return {f"s{i}": {'image': 'nginx', 'environment': dict(environment)} for i in range(count)}
+
+
+def test_skips_groups_that_do_not_save_bytes():
+    services = _services(2, {'A': '1', 'B': '2', 'C': '3'})
+    extractor = SharedEnvExtractor()
+
+    assert extractor.extract(services) == {}
+    assert services['s0'] == {'image': 'nginx', 'environment': {'A': '1', 'B': '2', 'C': '3'}}
+
+
+def test_keeps_interpolated_values_inline():
+    services = _services(4, {
+        'DATABASE_URL': 'postgres://db:5432/app',
+        'REDIS_URL': 'redis://cache:6379/0',
+        'LOG_LEVEL': 'info',
+        'HOME_URL': '$BASE/x',
+    })
+    extractor = SharedEnvExtractor()
+
+    files = extractor.extract(services)
+
+    assert list(files.values()) == ['DATABASE_URL=postgres://db:5432/app\nREDIS_URL=redis://cache:6379/0\nLOG_LEVEL=info\n']
+    assert services['s0']['environment'] == {'HOME_URL': '$BASE/x'}
+    assert services['s0']['env_file'] == [f"./env/{name}" for name in files]
+    assert extractor.bytes_after < extractor.bytes_before
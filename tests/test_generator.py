@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from generator import DockerComposeGenerator
+
+
+@pytest.mark.parametrize('shard_size', [0, -1])
+def test_non_positive_shard_size_is_rejected(shard_size):
+    with pytest.raises(ValueError, match='Shard size must be a positive integer'):
+        DockerComposeGenerator()._partition_services({}, 'size', shard_size, None)
+
+
+def test_size_sharding_requires_a_size():
+    with pytest.raises(ValueError, match='Sharding by size requires a shard size'):
+        DockerComposeGenerator()._partition_services({}, 'size', None, None)
+
+
+def _services(count, network='front'):
+    return {f"s{i}": {'image': 'nginx', 'networks': {network: {}}} for i in range(count)}
+
+
+def test_write_sharded_only_rewrites_changed_shards(tmp_path):
+    import yaml
+
+    output = str(tmp_path / 'compose.yml')
+    generator = DockerComposeGenerator()
+    services = _services(7)
+
+    first = generator.write_sharded(services, {'front': {}}, {}, output, shard_by='size', shard_size=3)
+    assert [(os.path.relpath(p, tmp_path), written) for p, written in first] == [
+        ('compose.d/services.yml', True),
+        ('compose.d/services-2.yml', True),
+        ('compose.d/services-3.yml', True),
+        ('compose.yml', True),
+    ]
+    with open(output, encoding='utf-8') as f:
+        root = yaml.safe_load(f)
+    assert root['include'] == [
+        {'path': 'compose.d/services.yml', 'project_directory': '.'},
+        {'path': 'compose.d/services-2.yml', 'project_directory': '.'},
+        {'path': 'compose.d/services-3.yml', 'project_directory': '.'},
+    ]
+
+    services['s6']['image'] = 'nginx:1'
+    second = generator.write_sharded(services, {'front': {}}, {}, output, shard_by='size', shard_size=3)
+    assert [written for _, written in second] == [False, False, True, False]
+
+
+def test_write_sharded_removes_only_stale_shards(tmp_path):
+    output = str(tmp_path / 'compose.yml')
+    generator = DockerComposeGenerator()
+    generator.write_sharded(_services(7), {'front': {}}, {}, output, shard_by='size', shard_size=3)
+    (tmp_path / 'compose.d' / 'handwritten.yml').write_text('services: {}\n', encoding='utf-8')
+
+    generator.write_sharded(_services(4), {'front': {}}, {}, output, shard_by='size', shard_size=3)
+
+    assert sorted(os.listdir(tmp_path / 'compose.d')) == ['handwritten.yml', 'services-2.yml', 'services.yml']
+
+
+def test_add_parsed_returns_only_new_service_and_changed_resources():
+    import yaml
+    from parser import DockerRunParser
+
+    parser = DockerRunParser()
+    generator = DockerComposeGenerator()
+    services, networks, volumes = {}, {}, {}
+
+    def add(command):
+        return yaml.safe_load(generator.add_parsed(parser.parse(command), services, networks, volumes))
+
+    first = add('docker run -d --name web --network front nginx')
+    assert list(first['services']) == ['web']
+    assert first['networks'] == {'front': {'driver': 'bridge'}}
+
+    second = add('docker run -d --name api --network front node')
+    assert list(second) == ['services']
+    assert list(second['services']) == ['api']
+
+    third = add('docker run -d --name db --network back mysql')
+    assert list(third) == ['services', 'networks']
+    assert third['networks'] == {'front': {'driver': 'bridge'}, 'back': {'driver': 'bridge'}}
+    assert list(services) == ['web', 'api', 'db']
+
+
+def _sample():
+    services = {
+        'web': {'image': 'nginx', 'ports': ['80:80'], 'environment': {'GREETING': 'héllo "world"', 'N': '1'},
+                'command': ['sh', '-c', 'echo $HOME\n'], 'networks': {'front': {}}},
+        'db': {'image': 'mysql:8', 'privileged': True, 'volumes': ['data:/var/lib/mysql']},
+    }
+    return services, {'front': {'driver': 'bridge'}}, {'data': {}}
+
+
+def test_json_output_round_trips():
+    import json
+
+    generator = DockerComposeGenerator(output_format='json')
+    services, networks, volumes = _sample()
+
+    assert json.loads(generator.generate(services, networks, volumes)) == generator.build(services, networks, volumes)
+
+
+def test_ndjson_output_round_trips():
+    import json
+
+    generator = DockerComposeGenerator(output_format='ndjson')
+    services, networks, volumes = _sample()
+
+    lines = generator.generate(services, networks, volumes).splitlines()
+    assert [json.loads(line) for line in lines] == [{'name': name, 'service': service}
+                                                    for name, service in services.items()]
@@ -0,0 +1,22 @@
+from cli import CLI
+
+
+def _commands(count):
+    commands = []
+    for i in range(count):
+        # 部分重名、共享网络，结果依赖按输入顺序确定服务名和收集 networks
+        name = f"svc{i}" if i % 4 else 'dup'
+        commands.append(f'docker run -d --name {name} --network net{i % 3} -p {8000 + i}:80 '
+                        f'-e INDEX={i} -e "GREETING=hello world" -v /srv/{i}:/data:ro nginx:{i % 5} sh -c "echo {i}"')
+    return commands
+
+
+def test_parallel_output_matches_serial_byte_for_byte(tmp_path, capsys):
+    commands = _commands(300)
+    serial = tmp_path / 'serial.yml'
+    parallel = tmp_path / 'parallel.yml'
+
+    CLI().run(commands + ['-o', str(serial)])
+    CLI().run(commands + ['-o', str(parallel), '--jobs', '3', '--chunk-size', '7'])
+
+    assert parallel.read_bytes() == serial.read_bytes()
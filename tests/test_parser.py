@@ -0,0 +1,78 @@
+import random
+import shlex
+
+import pytest
+
+from parser import DockerRunParser, ParseLimitError, ParseLimits
+
+SPLIT_CASES = [
+    'docker run nginx',
+    'docker   run\t-d\n--name  web nginx',
+    '  leading and trailing  ',
+    '',
+    'a"b c"d',
+    "a'b c'd",
+    'x "" y \'\' z',
+    r'echo "a \" b" "c\\d" "e\$f" "g\h"',
+    r"echo 'no \escape in single'",
+    r'a\ b \"c\" \\ d\'e',
+    '-e "JSON={\\"k\\": [1, 2]}" -e \'SQL=select * from "t"\'',
+    'ünïcode "引号 内" 值',
+]
+
+ERROR_CASES = [
+    'echo "unclosed',
+    "echo 'unclosed",
+    'echo trailing\\',
+    'echo "ends with escape\\',
+    'echo "ends with escaped backslash\\\\',
+]
+
+
+@pytest.mark.parametrize('command', SPLIT_CASES)
+def test_split_matches_shlex(command):
+    assert DockerRunParser().split(command) == shlex.split(command)
+
+
+@pytest.mark.parametrize('command', ERROR_CASES)
+def test_split_errors_match_shlex(command):
+    with pytest.raises(ValueError) as expected:
+        shlex.split(command)
+    with pytest.raises(ValueError, match=str(expected.value)):
+        DockerRunParser().split(command)
+
+
+def test_split_matches_shlex_on_random_input():
+    rng = random.Random(0)
+    parser = DockerRunParser()
+    for _ in range(2000):
+        command = ''.join(rng.choice('ab \t\n"\'\\$=') for _ in range(rng.randint(0, 12)))
+        try:
+            expected = shlex.split(command)
+        except ValueError as e:
+            with pytest.raises(ValueError, match=str(e)):
+                parser.split(command)
+        else:
+            assert parser.split(command) == expected, command
+
+
+def test_command_length_limit():
+    parser = DockerRunParser(ParseLimits(max_command_length=20))
+    with pytest.raises(ParseLimitError, match='exceeds 20 characters'):
+        parser.parse('docker run -d --name web nginx')
+
+
+def test_token_limit():
+    parser = DockerRunParser(ParseLimits(max_tokens=4))
+    assert parser.split('docker run -d nginx') == ['docker', 'run', '-d', 'nginx']
+    with pytest.raises(ParseLimitError, match='exceeds 4 tokens'):
+        parser.split('docker run -d nginx sh')
+    with pytest.raises(ParseLimitError, match='exceeds 4 tokens'):
+        parser.split('docker run -d nginx sh -c true')
+
+
+def test_values_per_flag_limit():
+    parser = DockerRunParser(ParseLimits(max_values_per_flag=2))
+    assert parser.parse('docker run -e A=1 -e B=2 nginx')['params']['env'] == ['A=1', 'B=2']
+    with pytest.raises(ParseLimitError, match="Too many values for 'env' \\(limit 2\\)"):
+        parser.parse('docker run -e A=1 -e B=2 --env C=3 nginx')
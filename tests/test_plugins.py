@@ -0,0 +1,74 @@
+import sys
+import textwrap
+
+from mapper import DockerComposeMapper
+from parser import DockerRunParser
+from plugins import PluginRegistry
+
+
+def _write_plugin(tmp_path, monkeypatch, name, body):
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(body), encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop(name, None)
+
+
+def _map(registry, command):
+    return DockerComposeMapper(plugins=registry).map_to_service(DockerRunParser().parse(command))
+
+
+def test_unknown_flag_handler(tmp_path, monkeypatch):
+    _write_plugin(tmp_path, monkeypatch, 'plugin_unknown_flag', """
+        def register(plugin):
+            plugin.add_flag_handler('--my-flag', lambda service, value, parsed: service.update(x_my_flag=value))
+    """)
+    registry = PluginRegistry()
+    registry.declare('plugin_unknown_flag', ['--my-flag'])
+
+    service = _map(registry, 'docker run --name a --my-flag on nginx')
+
+    assert service['x_my_flag'] == 'on'
+
+
+def test_short_alias_flag_handler(tmp_path, monkeypatch):
+    _write_plugin(tmp_path, monkeypatch, 'plugin_short_flag', """
+        def register(plugin):
+            plugin.add_flag_handler('-e', lambda service, value, parsed: service['environment'].update(INJECTED='1'))
+    """)
+    registry = PluginRegistry()
+    registry.declare('plugin_short_flag', ['-e'])
+
+    service = _map(registry, 'docker run --name a -e A=1 nginx')
+
+    assert service['environment'] == {'A': '1', 'INJECTED': '1'}
+
+
+def test_plugin_not_imported_without_its_flags(tmp_path, monkeypatch):
+    _write_plugin(tmp_path, monkeypatch, 'plugin_lazy', """
+        def register(plugin):
+            plugin.add_flag_handler('--my-flag', lambda service, value, parsed: None)
+    """)
+    registry = PluginRegistry()
+    registry.declare('plugin_lazy', ['--my-flag'])
+
+    _map(registry, 'docker run --name a nginx')
+
+    assert 'plugin_lazy' not in sys.modules
+
+
+def test_bool_flag_does_not_consume_the_image(tmp_path, monkeypatch):
+    _write_plugin(tmp_path, monkeypatch, 'plugin_bool_flag', """
+        def register(plugin):
+            plugin.add_flag_handler('--site-internal', lambda service, value, parsed: service.update(x_internal=value))
+    """)
+    config = tmp_path / 'plugins.yml'
+    config.write_text('plugins:\n  - module: plugin_bool_flag\n    flags: [--site-internal:bool]\n', encoding='utf-8')
+    registry = PluginRegistry.discover(str(config))
+    parser = DockerRunParser()
+    registry.configure_parser(parser)
+
+    parsed = parser.parse('docker run --name a --site-internal nginx')
+    service = DockerComposeMapper(plugins=registry).map_to_service(parsed)
+
+    assert parsed['image'] == 'nginx'
+    assert service['image'] == 'nginx'
+    assert service['x_internal'] is True
@@ -0,0 +1,24 @@
+from ports import PortConflictAnalyzer
+
+
+def _pairs(services):
+    return [(a.describe(), b.describe()) for a, b in PortConflictAnalyzer().find_conflicts(services)]
+
+
+def test_distinct_host_ips_do_not_conflict():
+    services = {f"s{i}": {'ports': [f"10.0.0.{i}:80:80"]} for i in range(1, 50)}
+    assert _pairs(services) == []
+
+
+def test_wildcard_conflicts_with_every_ip():
+    services = {
+        'a': {'ports': ['10.0.0.1:80:80']},
+        'b': {'ports': ['10.0.0.2:80:80']},
+        'c': {'ports': ['80-81:80']},
+        'd': {'ports': ['10.0.0.1:81:81', '81:81/udp']},
+    }
+    assert _pairs(services) == [
+        ('a 10.0.0.1:80/tcp', 'c 0.0.0.0:80-81/tcp'),
+        ('b 10.0.0.2:80/tcp', 'c 0.0.0.0:80-81/tcp'),
+        ('c 0.0.0.0:80-81/tcp', 'd 10.0.0.1:81/tcp'),
+    ]
@@ -0,0 +1,40 @@
+from secret_detector import SecretDetector
+
+
+def test_key_rules_match_whole_words_only():
+    detector = SecretDetector()
+
+    assert detector.detect('MYSQL_ROOT_PASSWORD', 'x') == 'password'
+    assert detector.detect('DB_PASS', 'x') == 'password'
+    assert detector.detect('GITHUB_TOKEN', 'x') == 'token'
+    assert detector.detect('PWD', '/app') is None
+    assert detector.detect('BYPASS_CACHE', '1') is None
+    assert detector.detect('PASSENGER_APP_ENV', 'production') is None
+    assert detector.detect('COMPASS', 'north') is None
+
+
+def test_extract_uses_file_env_convention_by_default():
+    detector = SecretDetector()
+    service = {'environment': {'MYSQL_ROOT_PASSWORD': 'secret', 'TZ': 'UTC'}}
+
+    detector.extract('db', service)
+
+    assert service['environment'] == {
+        'TZ': 'UTC',
+        'MYSQL_ROOT_PASSWORD_FILE': '/run/secrets/db_mysql_root_password',
+    }
+    assert service['secrets'] == ['db_mysql_root_password']
+    assert detector.extracted['db_mysql_root_password']['value'] == 'secret'
+
+
+def test_extract_without_file_env_removes_variable_and_warns():
+    detector = SecretDetector(file_env=False)
+    service = {'environment': {'MYSQL_ROOT_PASSWORD': 'secret'}}
+
+    detector.extract('db', service)
+
+    assert 'environment' not in service
+    assert service['secrets'] == ['db_mysql_root_password']
+    report = detector.report()
+    assert '  db.MYSQL_ROOT_PASSWORD -> secrets/db_mysql_root_password variable removed (password)' in report
+    assert any(line.startswith('Warning: 1 variable(s) removed') for line in report)